@@ -0,0 +1,9 @@
+CASES = {}
+
+
+def bench(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
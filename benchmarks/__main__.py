@@ -0,0 +1,105 @@
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from fnmatch import fnmatch
+from time import perf_counter
+
+import benchmarks.cases  # noqa: F401
+from benchmarks import CASES
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("patterns", nargs="*", default=["*"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    baseline = _load(args.compare) if args.compare else {}
+    results = {}
+    regressed = []
+
+    print(f"{'benchmark':<24}{'ops/s':>14}{'peak':>12}{'change':>10}")
+
+    for name, setup in CASES.items():
+        if not any(fnmatch(name, p) for p in args.patterns):
+            continue
+
+        run = setup()
+        results[name] = {
+            "ops": _throughput(run, args.repeat, args.min_time),
+            "peak": _peak(run),
+        }
+        change = ""
+
+        if name in baseline:
+            ratio = results[name]["ops"] / baseline[name]["ops"] - 1
+            change = f"{ratio:+.1%}"
+
+            if ratio < -args.tolerance:
+                regressed.append(name)
+
+        print(
+            f"{name:<24}{results[name]['ops']:>14,.0f}"
+            f"{_bytes(results[name]['peak']):>12}{change:>10}"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if regressed:
+        print(f"\nSlower than baseline: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def _throughput(run, repeat, min_time):
+    number = 1
+
+    while (elapsed := _time(run, number)) < min_time:
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    return max(number / _time(run, number) for _ in range(repeat))
+
+
+def _time(run, number):
+    start = perf_counter()
+
+    for _ in range(number):
+        run()
+
+    return perf_counter() - start
+
+
+def _peak(run):
+    tracemalloc.start()
+
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _bytes(n):
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+
+        n /= 1024
+
+    return f"{n:.1f} GiB"
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+sys.exit(main())
@@ -0,0 +1,152 @@
+from benchmarks import bench
+from protestr import provide, resolve, resolve_many
+from protestr.specs import between, choice, choices, recipe, sample
+
+
+class Resource:
+    def __teardown__(self):
+        pass
+
+
+def _resolving(spec):
+    def run():
+        resolve(spec)
+
+    return run
+
+
+for _spec in (int, float, complex, bool, str):
+    bench(f"resolve/{_spec.__name__}")(lambda spec=_spec: _resolving(spec))
+
+
+@bench("resolve/list")
+def _():
+    return _resolving([int, str, float] * 4)
+
+
+@bench("resolve/tuple")
+def _():
+    return _resolving((int, str, float) * 4)
+
+
+@bench("resolve/set")
+def _():
+    return _resolving({int, str, float, bool})
+
+
+@bench("resolve/dict")
+def _():
+    return _resolving({str: int, "id": int, "name": str, "scores": [float] * 3})
+
+
+@bench("resolve/constants")
+def _():
+    return _resolving(
+        {"host": "localhost", "ports": (80, 443), "tags": ["a", "b", "c"], "id": int}
+    )
+
+
+@bench("resolve/deep")
+def _():
+    spec = int
+
+    for _ in range(100):
+        spec = [spec]
+
+    return _resolving(spec)
+
+
+@bench("resolve/wide")
+def _():
+    return _resolving({f"key{i}": [int, str] for i in range(500)})
+
+
+@bench("specs/between")
+def _():
+    return _resolving(between(1, 99))
+
+
+@bench("specs/choice")
+def _():
+    return _resolving(choice(*range(100)))
+
+
+@bench("specs/sample")
+def _():
+    return _resolving(sample("abcdefghijklmnopqrstuvwxyz", k=5))
+
+
+@bench("specs/choices")
+def _():
+    return _resolving(choices(*range(100), k=10))
+
+
+@bench("specs/recipe")
+def _():
+    return _resolving(recipe(int, str, then=lambda xs: "".join(map(str, xs))))
+
+
+@bench("resolve_many/dict")
+def _():
+    spec = {"id": between(1, 99), "name": str, "score": float}
+
+    def run():
+        resolve_many(spec, 1000)
+
+    return run
+
+
+@bench("resolve_many/provided")
+def _():
+    @provide(id=between(1, 99), name=str, password=str)
+    class User:
+        def __init__(self, id, name, password):
+            pass
+
+    def run():
+        resolve_many(User, 1000)
+
+    return run
+
+
+@bench("provide/single")
+def _():
+    @provide(id=between(1, 99), name=str, password=str)
+    def fn(id, name, password):
+        pass
+
+    return fn
+
+
+@bench("provide/chained")
+def _():
+    def fn(id, name):
+        pass
+
+    for i in range(10):
+        fn = provide(id=i)(fn)
+
+    return provide(id=int, name=str)(fn)
+
+
+@bench("provide/class")
+def _():
+    @provide(id=between(1, 99), name=str, password=str)
+    class User:
+        def __init__(self, id, name, password):
+            pass
+
+    @provide(users=[User] * 10)
+    def fn(users):
+        pass
+
+    return fn
+
+
+@bench("provide/teardown")
+def _():
+    @provide(resources=[Resource] * 1000, nested={"a": [Resource] * 100})
+    def fn(resources, nested):
+        pass
+
+    return fn
@@ -10,7 +10,7 @@ def add_to_users_db(users):
 
     client = pymongo.MongoClient(
         host=os.environ["MONGO_DB_HOST"],
-        port=27017,
+        port=int(os.environ["MONGO_DB_PORT"]),
     )
 
     client.users_db.users.insert_many([{"id": u.id, "name": u.name} for u in users])
@@ -18,21 +18,23 @@ def add_to_users_db(users):
     client.close()
 
 
-_cache = redis.Redis(
-    host="localhost",
-    port=6379,
-    password="",
-    decode_responses=True,
-)
+def _cache():
+    return redis.Redis(
+        host="localhost",
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        password="",
+        decode_responses=True,
+    )
 
 
 def cached(fn):
     def cached(*args, **kwds):
         key = f"{fn.__module__}.{fn.__name__}"
+        cache = _cache()
 
-        if _cache.exists(key) == 0:
-            _cache.set(key, json.dumps(fn(*args, **kwds)))
+        if cache.exists(key) == 0:
+            cache.set(key, json.dumps(fn(*args, **kwds)))
 
-        return json.loads(_cache.get(key))
+        return json.loads(cache.get(key))
 
     return cached
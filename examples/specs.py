@@ -1,8 +1,7 @@
-from protestr import provide
-from protestr.specs import between
+from protestr import provide, resolve, port_open
+from protestr.specs import between, port
 import docker
 import pymongo
-import time
 
 
 @provide(id=between(1, 99), name=str, password=str)
@@ -15,10 +14,11 @@ class User:
 
 class MongoDB:
     def __init__(self):
+        self.port = resolve(port())
         self.container = docker.from_env().containers.run(
-            "mongo", detach=True, ports={27017: 27017}
+            "mongo", detach=True, ports={27017: self.port}
         )
-        self.client = pymongo.MongoClient("localhost", 27017)
+        self.client = pymongo.MongoClient("localhost", self.port)
 
     def __teardown__(self):
         self.client.close()
@@ -28,12 +28,13 @@ class MongoDB:
 
 class Redis:
     def __init__(self):
+        self.port = resolve(port())
         self.container = docker.from_env().containers.run(
-            "redis:8.0-M02", detach=True, ports={6379: 6379}
+            "redis:8.0-M02", detach=True, ports={6379: self.port}
         )
 
-        # wait for the port
-        time.sleep(0.1)
+    def __ready__(self):
+        return port_open("localhost", self.port)
 
     def __teardown__(self):
         self.container.stop()
@@ -13,7 +13,10 @@ class TestWithMongo(unittest.TestCase):
     @provide(users=[])
     @mock("examples.lib.os")
     def test_add_to_users_db_should_add_all_users(self, os, users, mongo):
-        os.environ.__getitem__.return_value = "localhost"
+        os.environ.__getitem__.side_effect = {
+            "MONGO_DB_HOST": "localhost",
+            "MONGO_DB_PORT": str(mongo.port),
+        }.__getitem__
 
         add_to_users_db(users)
 
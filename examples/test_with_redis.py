@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from protestr import provide
 from examples.lib import cached
 from examples.specs import Redis
@@ -7,11 +7,11 @@ from examples.specs import Redis
 
 class TestWithRedis(unittest.TestCase):
     @provide(
-        Redis,
+        redis=Redis,
         response={str: str},
     )
     @provide(response=None)
-    def test_cached_should_cache_fn(self, response):
+    def test_cached_should_cache_fn(self, redis, response):
         costly_computation = MagicMock()
 
         @cached
@@ -19,8 +19,9 @@ class TestWithRedis(unittest.TestCase):
             costly_computation()
             return response
 
-        self.assertEqual(response, fn())
-        self.assertEqual(response, fn())
+        with patch.dict("os.environ", {"REDIS_PORT": str(redis.port)}):
+            self.assertEqual(response, fn())
+            self.assertEqual(response, fn())
 
         costly_computation.assert_called_once()
 
@@ -1,2 +1,11 @@
+from protestr._batch import resolve_many as resolve_many
+from protestr._corpus import Corpus as Corpus
 from protestr._provider import provide as provide
+from protestr._provider import settings as settings
+from protestr._ready import port_open as port_open
 from protestr._resolver import resolve as resolve
+from protestr._resolver import resolve_async as resolve_async
+from protestr._rng import seeded as seeded
+from protestr._scopes import release as release
+from protestr._teardown import TeardownError as TeardownError
+from protestr._teardown import drain as drain
@@ -0,0 +1,86 @@
+import os
+from contextlib import suppress
+from socket import socket
+from tempfile import gettempdir
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+ATTEMPTS = 100
+
+
+class Allocation(int):
+    __reusable__ = True
+
+    def __new__(cls, value, lock):
+        allocation = super().__new__(cls, value)
+        allocation._lock = lock
+        return allocation
+
+    def __reduce__(self):
+        return int, (int(self),)
+
+    def __teardown__(self):
+        if fcntl:
+            with suppress(OSError):
+                os.remove(self._lock.name)
+
+        self._lock.close()
+
+
+def allocate_port(host=""):
+    for _ in range(ATTEMPTS):
+        with socket() as s:
+            s.bind((host, 0))
+            port = s.getsockname()[1]
+
+        if lock := _lock(f"port-{port}"):
+            return Allocation(port, lock)
+
+    raise RuntimeError(f"no free port found in {ATTEMPTS} attempts")
+
+
+def allocate_slot(name):
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"slot name must be a non-empty string, not {name!r}")
+
+    for i in range(ATTEMPTS):
+        if lock := _lock(f"slot-{quote(name, safe='')}-{i}"):
+            return Allocation(i, lock)
+
+    raise RuntimeError(f"no free {name!r} slot found in {ATTEMPTS} attempts")
+
+
+def _lock(name):
+    os.makedirs(path := os.path.join(gettempdir(), "protestr"), exist_ok=True)
+    path = os.path.join(path, f"{name}.lock")
+
+    while True:
+        f = open(path, "a+b")  # noqa: SIM115
+
+        try:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            with suppress(OSError):
+                f.close()
+
+            return None
+
+        if not fcntl or _linked(f, path):
+            return f
+
+        f.close()
+
+
+def _linked(f, path):
+    try:
+        return os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+    except FileNotFoundError:
+        return False
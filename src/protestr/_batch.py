@@ -0,0 +1,260 @@
+from array import array
+from functools import partial
+from inspect import Parameter, iscoroutinefunction, signature
+from itertools import repeat, starmap
+
+from protestr._hooks import observing
+from protestr._provider import _plan, _requirements
+from protestr._ready import wait_ready
+from protestr._resolver import _constant, resolve
+from protestr._rng import choices as randchoices
+from protestr._rng import getrandbits, random, seeded
+from protestr._scopes import targeting
+from protestr._teardown import registering, teardown, track
+from protestr._types import _bulk as _leaves
+from protestr._types import _lengths, _options, _slices
+
+
+def resolve_many(spec, n, columns=False, numpy=None, rng=None, record=None):
+    if rng is not None:
+        with seeded(rng):
+            return resolve_many(spec, n, columns, numpy, record=record)
+
+    if record is not None and not _batchable(spec):
+        raise TypeError(f"Cannot build records of {spec!r}: not a provided target")
+
+    batch = _Batch(n, _numpy_rng(required=numpy) if numpy is not False else None)
+
+    if record is not None:
+        return batch.provided(spec, record=record)
+
+    return batch.columns(spec) if columns else batch.rows(spec)
+
+
+class _Batch:
+    def __init__(self, n, rng):
+        self.n = n
+        self.rng = rng
+
+    def rows(self, spec):
+        if isinstance(spec, type) and spec in _leaves:
+            column = _leaves[spec](self.n, self.rng)
+            return column if isinstance(column, list) else column.tolist()
+
+        if isinstance(spec, tuple):
+            return [*zip(*map(self.rows, spec))] if spec else [()] * self.n
+
+        if isinstance(spec, list):
+            return [[*row] for row in self._zip(spec)]
+
+        if isinstance(spec, set):
+            return [{*row} for row in self._zip(spec)]
+
+        if isinstance(spec, dict):
+            return [
+                dict(zip(row[::2], row[1::2]))
+                for row in self._zip([x for kv in spec.items() for x in kv])
+            ]
+
+        if hasattr(spec, "__resolve_many__"):
+            return spec.__resolve_many__(self.n)
+
+        if _batchable(spec):
+            return self.provided(spec)
+
+        if callable(spec):
+            return [resolve(spec) for _ in repeat(None, self.n)]
+
+        track(spec)
+        return [spec] * self.n
+
+    def columns(self, spec):
+        if isinstance(spec, type) and spec in _leaves:
+            return self._compact(_leaves[spec](self.n, self.rng))
+
+        if _batchable(spec):
+            return self.provided(spec, columns=True)
+
+        if isinstance(spec, tuple):
+            return (*map(self.columns, spec),)
+
+        if isinstance(spec, list):
+            return [*map(self.columns, spec)]
+
+        if isinstance(spec, dict) and all(map(_constant, spec)):
+            return {k: self.columns(v) for k, v in spec.items()}
+
+        if isinstance(spec, (set, dict)) or not callable(spec):
+            return self.rows(spec)
+
+        return self._compact(self.rows(spec))
+
+    def provided(self, spec, columns=False, record=None):
+        target = spec.__fixture_target__
+        plan = _plan(spec)
+        patch = plan.patches[-1]
+        fixture = patch.fixture
+        params = plan.parameters
+        names = [k for k in params if k in fixture]
+        built = {}
+
+        with targeting(target), registering() as registry:
+            try:
+                for k in patch.ordered:
+                    with observing("resolve", fixture[k], k, None):
+                        built[k] = self._column(fixture[k], built)
+
+                wait_ready(
+                    [
+                        (None, r, r.__ready__)
+                        for r in registry.resources
+                        if hasattr(r, "__ready__")
+                    ],
+                    *plan.readiness,
+                )
+
+                if columns:
+                    return {k: self._compact(built[k]) for k in names}
+
+                rows = zip(*(built[k] for k in names)) if names else repeat((), self.n)
+
+                if record is None and _positional(params, names):
+                    return [*starmap(target, rows)]
+
+                if record is None:
+                    return [target(**dict(zip(names, row))) for row in rows]
+
+                fields = _accepted(record, names)
+                rows = zip(*(built[k] for k in fields)) if fields else rows
+                return [record(**dict(zip(fields, row))) for row in rows]
+            finally:
+                teardown(registry.resources)
+
+    def _column(self, spec, built):
+        if requirements := _requirements(spec):
+            return [
+                resolve(partial(spec, *args))
+                for args in zip(*(built[r] for r in requirements))
+            ]
+
+        return self.rows(spec)
+
+    def _zip(self, specs):
+        return zip(*map(self.rows, specs)) if specs else repeat((), self.n)
+
+    def _compact(self, column):
+        if not isinstance(column, list) or not column:
+            return column
+
+        if self.rng is not None and type(column[0]) in (int, float):
+            return _numpy.asarray(column)
+
+        for typecode, kind in (("q", int), ("d", float)):
+            if type(column[0]) is kind:
+                try:
+                    return array(typecode, column)
+                except (TypeError, OverflowError):
+                    break
+
+        return column
+
+
+def _batchable(spec):
+    return (
+        hasattr(spec, "__fixture_target__")
+        and not iscoroutinefunction(spec)
+        and not any(
+            spec.__fixture_settings__.get(option)
+            for option in ("seed", "processes", "corpus")
+        )
+    )
+
+
+def _accepted(fn, names):
+    params = signature(fn).parameters
+
+    if any(p.kind is Parameter.VAR_KEYWORD for p in params.values()):
+        return names
+
+    return [k for k in names if k in params]
+
+
+def _positional(params, names):
+    return (
+        all(
+            p.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+            for p in [*params.values()][: len(names)]
+        )
+        and names == [*params][: len(names)]
+    )
+
+
+def _ints(n, rng):
+    lo, hi = _options[int]["bounds"]
+
+    if rng is not None:
+        return rng.integers(lo, hi, size=n, endpoint=True)
+
+    return randchoices(range(lo, hi + 1), k=n)
+
+
+def _floats(n, rng, kind=float):
+    lo, hi = _options[kind]["bounds"]
+
+    if rng is not None:
+        return rng.uniform(lo, hi, size=n)
+
+    return [lo + (hi - lo) * random() for _ in repeat(None, n)]
+
+
+def _complexes(n, rng):
+    real, imag = _floats(n, rng, complex), _floats(n, rng, complex)
+
+    if rng is not None:
+        return real + 1j * imag
+
+    return [*map(complex, real, imag)]
+
+
+def _bools(n, rng):
+    if rng is not None:
+        return rng.integers(0, 1, size=n, endpoint=True).astype(bool)
+
+    return randchoices((True, False), k=n)
+
+
+def _strs(n, rng):
+    alphabet = _options[str]["alphabet"]
+    lengths = _lengths(str, n, rng)
+
+    if rng is not None and alphabet.isascii():
+        letters = _numpy.frombuffer(alphabet.encode(), dtype=_numpy.uint8)
+        chars = (
+            letters[rng.integers(0, len(letters), size=sum(lengths))].tobytes().decode()
+        )
+    else:
+        chars = "".join(randchoices(alphabet, k=sum(lengths)))
+
+    return _slices(chars, lengths)
+
+
+_leaves.update(
+    {int: _ints, float: _floats, complex: _complexes, bool: _bools, str: _strs}
+)
+
+_numpy = None
+
+
+def _numpy_rng(required):
+    global _numpy
+
+    if _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            if required:
+                raise
+
+            return None
+
+    return _numpy.random.default_rng(getrandbits(64))
@@ -0,0 +1,213 @@
+import os
+from contextlib import suppress
+from functools import partial
+from hashlib import sha1
+from logging import getLogger
+from mmap import ACCESS_READ, mmap
+from pickle import HIGHEST_PROTOCOL, PicklingError, UnpicklingError, dumps, loads
+from tempfile import NamedTemporaryFile
+from types import FunctionType, MethodType
+
+from protestr._teardown import _resources
+from protestr._types import _options
+
+MODES = ("replay", "record")
+
+_hooks = ("__teardown__", "__ready__", "__snapshot__", "__reusable__")
+_fixture_attrs = ("__fixture_patches__", "__fixture_settings__", "__fixture_target__")
+_unpicklable = (PicklingError, TypeError, AttributeError)
+_unreadable = (
+    OSError,
+    EOFError,
+    UnpicklingError,
+    ImportError,
+    AttributeError,
+    LookupError,
+    TypeError,
+    ValueError,
+)
+_log = getLogger("protestr")
+
+
+class _Unfingerprintable(Exception):
+    pass
+
+
+class Corpus:
+    def __init__(self, path, max_bytes=None, mode="replay"):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}, not {mode!r}")
+
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.mode = mode
+
+    def entry(self, fn, patch, seed, fixture):
+        digest = sha1()
+
+        try:
+            _feed(digest, (fn.__module__, fn.__qualname__, patch, seed), set())
+            _feed(digest, fixture, set())
+        except _Unfingerprintable as e:
+            _log.warning(f"Not recording {fn.__qualname__}: cannot fingerprint {e}")
+            return None
+
+        digest.update(repr(_options).encode())
+        return digest.hexdigest()
+
+    def load(self, entry):
+        if self.mode == "record" or entry is None:
+            return {}
+
+        path = self._file(entry)
+
+        try:
+            with open(path, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as m:
+                values = loads(m)
+
+            os.utime(path)
+        except FileNotFoundError:
+            return {}
+        except _unreadable:
+            with suppress(OSError):
+                os.remove(path)
+
+            return {}
+
+        return {k: loads(v) for k, v in values.items()}
+
+    def store(self, entry, values):
+        pickled = {}
+
+        for k, v in values.items():
+            if not any(_resources([v], hook) for hook in _hooks):
+                try:
+                    pickled[k] = dumps(v, HIGHEST_PROTOCOL)
+                except _unpicklable as e:
+                    _log.warning(f"Not recording {k}: {type(e).__name__}: {e}")
+
+        if not pickled:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+
+        with NamedTemporaryFile("wb", dir=self.path, delete=False) as f:
+            f.write(dumps(pickled, HIGHEST_PROTOCOL))
+
+        os.replace(f.name, self._file(entry))
+        self._evict()
+
+    def clear(self):
+        for entry in self._entries():
+            os.remove(entry.path)
+
+    def _file(self, entry):
+        return os.path.join(self.path, f"{entry}.pickle")
+
+    def _entries(self):
+        try:
+            return [e for e in os.scandir(self.path) if e.name.endswith(".pickle")]
+        except FileNotFoundError:
+            return []
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+
+        entries = sorted(
+            (
+                (s.st_mtime, s.st_size, e.path)
+                for e in self._entries()
+                for s in [e.stat()]
+            ),
+            reverse=True,
+        )
+        total = sum(size for _, size, _ in entries)
+
+        while total > self.max_bytes and entries:
+            _, size, path = entries.pop()
+            total -= size
+
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def fingerprint(spec):
+    digest = sha1()
+    _feed(digest, spec, set())
+    return digest.hexdigest()
+
+
+def _feed(digest, spec, active):
+    if isinstance(spec, (str, bytes, int, float, complex, bool, type(None))):
+        digest.update(f"{type(spec).__name__}:{spec!r};".encode())
+        return
+
+    if id(spec) in active:
+        digest.update(b"<cycle>;")
+        return
+
+    active.add(id(spec))
+    digest.update(f"{type(spec).__module__}.{type(spec).__qualname__}(".encode())
+
+    if isinstance(spec, (tuple, list)):
+        for x in spec:
+            _feed(digest, x, active)
+    elif isinstance(spec, (set, frozenset)):
+        for x in sorted(map(fingerprint, spec)):
+            digest.update(x.encode())
+    elif isinstance(spec, dict):
+        for k, v in spec.items():
+            _feed(digest, k, active)
+            _feed(digest, v, active)
+    elif isinstance(spec, type):
+        digest.update(f"{spec.__module__}.{spec.__qualname__}".encode())
+    elif isinstance(spec, FunctionType):
+        _feed(digest, (spec.__module__, spec.__qualname__), active)
+        _feed_code(digest, spec.__code__, active)
+        _feed(digest, spec.__defaults__, active)
+        _feed(digest, spec.__kwdefaults__, active)
+        _feed(digest, [_contents(c) for c in spec.__closure__ or ()], active)
+
+        if hasattr(spec, "__fixture_patches__"):
+            _feed(digest, [getattr(spec, a) for a in _fixture_attrs], active)
+        else:
+            _feed(digest, spec.__dict__, active)
+    elif isinstance(spec, MethodType):
+        _feed(digest, (spec.__func__, type(spec.__self__)), active)
+    elif isinstance(spec, partial):
+        _feed(digest, (spec.func, spec.args, spec.keywords), active)
+    elif hasattr(spec, "__fingerprint__"):
+        _feed(digest, spec.__fingerprint__(), active)
+    elif hasattr(spec, "__qualname__"):
+        digest.update(f"{spec.__module__}.{spec.__qualname__}".encode())
+    else:
+        digest.update(_pickled(spec))
+
+    digest.update(b");")
+    active.discard(id(spec))
+
+
+def _pickled(spec):
+    try:
+        return dumps(spec, HIGHEST_PROTOCOL)
+    except _unpicklable:
+        raise _Unfingerprintable(repr(spec)) from None
+
+
+def _feed_code(digest, code, active):
+    digest.update(code.co_code)
+    _feed(digest, code.co_names, active)
+
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _feed_code(digest, const, active)
+        else:
+            _feed(digest, const, active)
+
+
+def _contents(cell):
+    try:
+        return cell.cell_contents
+    except ValueError:
+        return None
@@ -0,0 +1,109 @@
+from asyncio import ensure_future
+from asyncio import wait as wait_async
+from concurrent.futures import Future, wait
+from contextvars import copy_context
+from inspect import isawaitable
+from threading import Thread
+from time import monotonic
+
+from protestr._hooks import name
+
+
+class Deadlines:
+    def __init__(self, timeout=None, limits=None, action="resolved"):
+        self.timeout = timeout
+        self.limits = {k: s for k, s in (limits or {}).items() if s is not None}
+        self.action = action
+        self.end = None if timeout is None else monotonic() + timeout
+        self.started = {}
+
+    def __bool__(self):
+        return self.end is not None or bool(self.limits)
+
+    def start(self, k):
+        if k in self.limits:
+            self.started[k] = monotonic()
+
+    def bound(self, k):
+        if self.end is None and k not in self.started:
+            return None
+
+        bounds = []
+
+        if self.end is not None:
+            bounds.append((self.end, self.timeout))
+
+        if k in self.limits and k in self.started:
+            bounds.append((self.started[k] + self.limits[k], self.limits[k]))
+
+        return min(bounds, default=None)
+
+    def remaining(self, keys):
+        ends = [bound[0] for k in keys if (bound := self.bound(k))]
+        return max(min(ends) - monotonic(), 0) if ends else None
+
+    def overdue(self, keys, specs):
+        now = monotonic()
+
+        for k in keys:
+            if (bound := self.bound(k)) and bound[0] <= now:
+                return self.expired(k, specs[k], bound[1])
+
+    def expired(self, k, spec, seconds):
+        return TimeoutError(
+            f"{k} ({name(spec)}) was not {self.action} within {seconds}s"
+        )
+
+    def call(self, k, spec, fn, *args, discard=None):
+        if (bound := self.bound(k)) is None:
+            return fn(*args)
+
+        future = spawn(fn, *args)
+
+        if not wait([future], max(bound[0] - monotonic(), 0)).done:
+            abandon(future, discard)
+            raise self.expired(k, spec, bound[1])
+
+        return future.result()
+
+    async def call_async(self, k, spec, fn, *args):
+        if (bound := self.bound(k)) is None:
+            return await _called(fn, *args)
+
+        task = ensure_future(_called(fn, *args))
+        done, _ = await wait_async({task}, timeout=max(bound[0] - monotonic(), 0))
+
+        if not done:
+            task.cancel()
+            raise self.expired(k, spec, bound[1])
+
+        return task.result()
+
+
+def spawn(fn, *args):
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run():
+        try:
+            result = fn(*args)
+        except BaseException as e:  # noqa: BLE001
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    Thread(target=copy_context().run, args=(run,), daemon=True).start()
+    return future
+
+
+async def _called(fn, *args):
+    result = fn(*args)
+    return await result if isawaitable(result) else result
+
+
+def abandon(future, discard=None):
+    def settle(future):
+        if discard and not future.exception():
+            discard(future.result())
+
+    future.add_done_callback(settle)
@@ -0,0 +1,143 @@
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from json import dump
+from os import getpid
+from threading import get_ident
+from time import perf_counter
+
+Event = namedtuple(
+    "Event", "kind phase spec key patch depth thread start duration", defaults=(None,)
+)
+
+_hooks = []
+_depth = ContextVar("protestr.depth", default=0)
+_unobserved = nullcontext()
+
+
+def add_hook(hook):
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+def nesting():
+    return _nesting() if _hooks else _unobserved
+
+
+def observing(kind, spec, key=None, patch=None):
+    return _observing(kind, spec, key, patch) if _hooks else _unobserved
+
+
+@contextmanager
+def _nesting():
+    token = _depth.set(_depth.get() + 1)
+
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+
+
+@contextmanager
+def _observing(kind, spec, key, patch):
+    start = perf_counter()
+    event = Event(kind, "start", spec, key, patch, _depth.get(), get_ident(), start)
+    _fire(event)
+
+    try:
+        yield
+    finally:
+        _fire(event._replace(phase="end", duration=perf_counter() - start))
+
+
+def _fire(event):
+    for hook in [*_hooks]:
+        hook(event)
+
+
+class Collector:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        if event.phase == "end":
+            self.events.append(event)
+
+    def __enter__(self):
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_hook(self)
+
+    def costs(self):
+        costs = {}
+
+        for e in self.events:
+            count, total, longest = costs.get((e.kind, name(e.spec)), (0, 0.0, 0.0))
+            costs[e.kind, name(e.spec)] = (
+                count + 1,
+                total + e.duration,
+                max(longest, e.duration),
+            )
+
+        return dict(sorted(costs.items(), key=lambda kv: -kv[1][1]))
+
+    def summary(self):
+        lines = [f"{'kind':<10}{'spec':<40}{'count':>8}{'total':>12}{'max':>12}"]
+
+        for (kind, spec), (count, total, longest) in self.costs().items():
+            lines.append(
+                f"{kind:<10}{spec[:39]:<40}{count:>8}{total:>11.4f}s{longest:>11.4f}s"
+            )
+
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        pid = getpid()
+
+        with open(path, "w") as f:
+            dump(
+                {
+                    "traceEvents": [
+                        {
+                            "name": name(e.spec),
+                            "cat": e.kind,
+                            "ph": "X",
+                            "ts": e.start * 1e6,
+                            "dur": e.duration * 1e6,
+                            "pid": pid,
+                            "tid": e.thread,
+                            "args": {
+                                "key": e.key,
+                                "patch": e.patch,
+                                "depth": e.depth,
+                            },
+                        }
+                        for e in self.events
+                    ]
+                },
+                f,
+            )
+
+
+def name(spec):
+    if hasattr(spec, "__wrapped__"):
+        return name(spec.__wrapped__)
+
+    if hasattr(spec, "__fixture_target__"):
+        return name(spec.__fixture_target__)
+
+    if isinstance(spec, type):
+        return f"{spec.__module__}.{spec.__qualname__}"
+
+    if hasattr(spec, "__teardown__"):
+        return name(type(spec))
+
+    if callable(spec) and hasattr(spec, "__qualname__"):
+        return f"{spec.__module__}.{spec.__qualname__}"
+
+    return repr(spec)
@@ -0,0 +1,157 @@
+import os
+from atexit import register
+from collections import deque
+from threading import Condition, Thread
+from time import monotonic
+from weakref import WeakSet
+
+from protestr._teardown import _Collecting, _raise, registering, teardown, track
+
+
+class Pool:
+    def __init__(self, spec, size, max_idle):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, not {size!r}")
+
+        self.spec = spec
+        self.size = size
+        self.max_idle = max_idle
+        self._idle = deque()
+        self._building = 0
+        self._error = None
+        self._closed = False
+        self._changed = Condition()
+        _pools.add(self)
+
+    def __call__(self):
+        from protestr import resolve
+
+        stale = self._evict()
+        value = error = _missing
+        resources = ()
+        self.warm()
+
+        with self._changed:
+            while not self._idle and self._building and not self._error:
+                self._changed.wait()
+
+            if self._idle:
+                _, value, resources = self._idle.popleft()
+            elif self._error:
+                error, self._error = self._error, None
+
+        self.warm()
+        _raise(_teardown_all(stale))
+
+        if error is not _missing:
+            raise error
+
+        for resource in resources:
+            track(resource)
+
+        return resolve(self.spec) if value is _missing else value
+
+    def __fingerprint__(self):
+        return self.spec, self.size, self.max_idle
+
+    def warm(self):
+        with self._changed:
+            if self._closed:
+                return
+
+            missing = self.size - len(self._idle) - self._building
+            self._building += max(missing, 0)
+
+        for _ in range(missing):
+            Thread(target=self._build, daemon=True).start()
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+
+            while self._building:
+                self._changed.wait()
+
+            idle = [resources for _, _, resources in self._idle]
+            self._idle.clear()
+
+        _raise(_teardown_all(idle))
+
+    def _build(self):
+        from protestr import resolve
+
+        try:
+            with registering() as registry:
+                value = resolve(self.spec)
+        except Exception as e:  # noqa: BLE001
+            _teardown_all([registry.resources])
+
+            with self._changed:
+                self._building -= 1
+                self._error = e
+                self._changed.notify_all()
+
+            return
+
+        with self._changed:
+            self._building -= 1
+
+            discard = self._closed
+
+            if not discard:
+                self._idle.append((monotonic(), value, registry.resources))
+
+            self._changed.notify_all()
+
+        if discard:
+            teardown(registry.resources)
+
+    def _evict(self):
+        if self.max_idle is None:
+            return []
+
+        deadline = monotonic() - self.max_idle
+        stale = []
+
+        with self._changed:
+            while self._idle and self._idle[0][0] < deadline:
+                stale.append(self._idle.popleft()[2])
+
+        return stale
+
+
+def _teardown_all(built):
+    errors = []
+
+    for resources in built:
+        with _Collecting(errors):
+            teardown(resources)
+
+    return errors
+
+
+def _close_all():
+    errors = []
+
+    for pool in [*_pools]:
+        with _Collecting(errors):
+            pool.close()
+
+    _raise(errors)
+
+
+_missing = object()
+_pools = WeakSet()
+
+
+def _after_fork():
+    for pool in _pools:
+        pool._idle.clear()
+        pool._building = 0
+        pool._error = None
+        pool._changed = Condition()
+
+
+register(_close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
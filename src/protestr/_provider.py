@@ -1,4 +1,54 @@
-from inspect import signature
+from asyncio import FIRST_EXCEPTION, ensure_future, gather
+from asyncio import wait as wait_async
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from contextvars import copy_context
+from copy import Error as CopyError
+from copy import deepcopy
+from functools import partial
+from inspect import iscoroutinefunction, signature
+from itertools import count
+from logging import getLogger
+from multiprocessing import get_all_start_methods, get_context
+
+from protestr._deadlines import Deadlines, abandon, spawn
+from protestr._hooks import _hooks, nesting, observing
+from protestr._pool import _close_all
+from protestr._ready import BACKOFF, TIMEOUT, probes, wait_ready, wait_ready_async
+from protestr._restore import restore, restore_async, reusable, snapshot
+from protestr._rng import _current, _Deferred, deferred, derive, getrandbits, seeded
+from protestr._scopes import _target, release, targeting
+from protestr._teardown import (
+    Registry,
+    _Collecting,
+    _raise,
+    _registry,
+    _resources,
+    drain,
+    registering,
+    teardown,
+    teardown_fixture,
+    teardown_fixture_async,
+)
+
+_log = getLogger("protestr")
+_jobs = {}
+_job_ids = count()
+_unseeded = nullcontext()
+_uncopyable = (CopyError, TypeError, AttributeError)
+_options = {
+    "lazy",
+    "workers",
+    "background",
+    "seed",
+    "processes",
+    "ready_timeout",
+    "ready_backoff",
+    "incremental",
+    "corpus",
+    "resolve_timeout",
+    "teardown_timeout",
+}
 
 
 def provide(*specs, **kwspecs):
@@ -7,56 +57,740 @@ def provide(*specs, **kwspecs):
             fn.__fixture_patches__.append(_combine(specs, kwspecs))
             return fn
 
-        def provided(*args, **kwds):
-            from protestr import resolve
+        if iscoroutinefunction(fn):
+
+            async def provided(*args, **kwds):
+                plan = _plan(provided)
+                seed = _seed(plan, True)
+
+                with targeting(fn), nesting(), _seeding(seed, fn):
+                    patches, other_kwds = plan.route(kwds)
+                    carried = {}
+
+                    for i in range(len(patches)):
+                        run = _Run(plan, patches, i, seed, carried)
+
+                        try:
+                            for snapshots in run.snapshots():
+                                await restore_async(snapshots)
+
+                            run.replay(fn)
+                            await _resolve_fixture_async(run)
+                            run.settle()
+
+                            with run.seeded():
+                                result = await fn(*args, **run.kwds(other_kwds))
+
+                            run.keep()
+                        finally:
+                            carried = run.kept
+                            await teardown_fixture_async(*run.leftovers())
+
+                    return result
+
+        else:
+
+            def provided(*args, **kwds):
+                plan = _plan(provided)
+                patches, other_kwds = plan.route(kwds)
 
-            first = provided.__fixture_patches__[-1]
-            overridden_specs = {}
-            other_kwds = {}
+                if plan.simple and not _hooks and all(p.simple for p in patches):
+                    return _call(plan, fn, patches, args, other_kwds)
 
-            for k, v in kwds.items():
-                if k in first:
-                    overridden_specs[k] = v
-                else:
-                    other_kwds[k] = v
+                seed = _seed(plan, plan.concurrent)
 
-            for patch in reversed(provided.__fixture_patches__):
-                fixture = first | patch | overridden_specs
+                with targeting(fn), nesting(), _seeding(seed, fn):
+                    carried = {}
 
-                resolved = {}
+                    def run_patch(i, following=True):
+                        nonlocal carried
 
-                try:
-                    for k, s in fixture.items():
-                        resolved[k] = resolve(s)
+                        run = _Run(plan, patches, i, seed, carried, following)
 
-                    requested_kwds = {
-                        k: v
-                        for k, v in resolved.items()
-                        if k in signature(fn).parameters
-                    }
+                        try:
+                            for snapshots in run.snapshots():
+                                restore(snapshots)
 
-                    result = fn(*args, **(requested_kwds | other_kwds))
-                finally:
-                    _teardown(resolved.values())
+                            run.replay(fn)
+                            _resolve_fixture(run, plan.workers)
+                            run.settle()
 
-            return result
+                            with run.seeded():
+                                result = fn(*args, **run.kwds(other_kwds))
+
+                            run.keep()
+                            return result
+                        finally:
+                            carried = run.kept
+                            teardown_fixture(
+                                *run.leftovers(), plan.workers, plan.background
+                            )
+
+                    if plan.processes and "fork" in get_all_start_methods():
+                        return _run_in_processes(
+                            plan.processes,
+                            partial(run_patch, following=False),
+                            len(patches),
+                        )
+
+                    for i in range(len(patches)):
+                        result = run_patch(i)
+
+                    return result
 
         provided.__fixture_patches__ = [_combine(specs, kwspecs)]
+        provided.__fixture_target__ = fn
+        provided.__fixture_settings__ = {**getattr(fn, "__fixture_settings__", {})}
+        provided.__fixture_plan__ = None
         return provided
 
     return provider
 
 
+def settings(**options):
+    if unknown := options.keys() - _options:
+        raise TypeError(
+            f"settings() has no option{'s' * (len(unknown) > 1)} "
+            f"{', '.join(sorted(unknown))}"
+        )
+
+    def configure(fn):
+        fn.__fixture_settings__ = getattr(fn, "__fixture_settings__", {}) | options
+        return fn
+
+    return configure
+
+
+class _Plan:
+    def __init__(self, provided):
+        settings = provided.__fixture_settings__
+        fn = provided.__fixture_target__
+
+        self.settings = settings
+        self.patches_of = provided.__fixture_patches__
+        self.count = len(self.patches_of)
+        self.workers = settings.get("workers", 1)
+        self.background = settings.get("background", False)
+        self.processes = settings.get("processes")
+        self.readiness = _readiness(provided)
+        self.incremental = settings.get("incremental")
+        self.corpus = settings.get("corpus")
+
+        if self.corpus is not None and settings.get("seed") is None:
+            raise ValueError(
+                f"{fn.__qualname__} needs a seed to record or replay its fixtures"
+            )
+
+        self.timeouts = (
+            settings.get("resolve_timeout"),
+            settings.get("teardown_timeout"),
+        )
+        self.lazy = settings.get("lazy", False)
+        self.parameters = signature(fn).parameters
+        self.params = frozenset(self.parameters)
+        self.first = self.patches_of[-1]
+        self.patches = self.compile({})
+        self.seed = settings.get("seed")
+        self.concurrent = self.workers > 1 or bool(self.processes)
+        self.simple = (
+            self.workers == 1
+            and not self.processes
+            and self.corpus is None
+            and self.timeouts == (None, None)
+        )
+
+    def stale(self, provided):
+        return self.settings is not provided.__fixture_settings__ or self.count != len(
+            provided.__fixture_patches__
+        )
+
+    def compile(self, overridden):
+        patches = []
+
+        for patch in reversed(self.patches_of):
+            fixture = self.first | patch | overridden
+
+            if self.lazy:
+                fixture = _with_requirements(
+                    fixture,
+                    [k for k in fixture if k in self.params or _is_positional(k)],
+                )
+
+            patches.append(_Patch(fixture))
+
+        return patches
+
+    def route(self, kwds):
+        if not kwds:
+            return self.patches, kwds
+
+        overridden = {k: v for k, v in kwds.items() if k in self.first}
+        other_kwds = {k: v for k, v in kwds.items() if k not in self.first}
+
+        return self.compile(overridden) if overridden else self.patches, other_kwds
+
+    def requested(self, resolved):
+        return {k: v for k, v in resolved.items() if k in self.params}
+
+    def deadlines(self, patch, teardown=False):
+        return Deadlines(
+            self.timeouts[teardown],
+            patch.limits[teardown],
+            "torn down" if teardown else "resolved",
+        )
+
+
+class _Run:
+    def __init__(self, plan, patches, i, seed, carried, following=True):
+        self.plan = plan
+        self.patch = patches[i]
+        self.fixture = self.patch.fixture
+        self.following = _following(patches, i) if following else None
+        self.path = seed, i
+        self.carried = carried
+        self.resolved = _reused(carried)
+        self.resources = {}
+        self.confirmed = set()
+        self.deadlines = plan.deadlines(self.patch)
+        self.entry = None
+        self.replayed = {}
+        self.snapshotted = {}
+        self.kept = {}
+
+    def snapshots(self):
+        return _restorable(self.carried)
+
+    def replay(self, fn):
+        self.entry, self.replayed = _replay(
+            self.plan.corpus, fn, self.fixture, self.resolved, self.resources, self.path
+        )
+
+    def wait_ready(self, keys):
+        keys = [k for k in keys if k not in self.confirmed]
+        wait_ready(self.probes(keys), *self.plan.readiness, self.path[1])
+        self.confirmed.update(keys)
+
+    async def wait_ready_async(self, keys):
+        keys = [k for k in keys if k not in self.confirmed]
+        await wait_ready_async(self.probes(keys), *self.plan.readiness, self.path[1])
+        self.confirmed.update(keys)
+
+    def probes(self, keys):
+        return probes(self.fixture, self.resolved, self.resources, keys)
+
+    def settle(self):
+        if self.entry and not self.replayed:
+            _record(
+                self.plan.corpus, self.entry, self.fixture, self.resolved, self.carried
+            )
+
+        self.snapshotted = _snapshots(
+            self.fixture,
+            self.resolved,
+            self.following,
+            self.carried,
+            self.plan.incremental,
+        )
+
+    def seeded(self, *keys):
+        return _seeded(self.path, *keys) if self.plan.concurrent else _unseeded
+
+    def kwds(self, other_kwds):
+        return self.plan.requested(self.resolved) | other_kwds
+
+    def keep(self):
+        self.kept = _kept(self.patch, self.resolved, self.following, self.snapshotted)
+
+    def leftovers(self):
+        return (
+            _unkept(self.resolved, self.kept),
+            self.patch.requirements,
+            self.path[1],
+            [v for v, _ in self.kept.values()],
+            self.resources,
+            self.plan.deadlines(self.patch, teardown=True),
+        )
+
+
+class _Patch:
+    def __init__(self, fixture):
+        self.fixture = fixture
+        self.ordered = _ordered(fixture)
+        self.requirements = {k: _requirements(s) for k, s in fixture.items()}
+        self.limits = [
+            {
+                k: d[i]
+                for k, s in fixture.items()
+                if (d := getattr(s, "__deadline__", None)) and d[i] is not None
+            }
+            for i in (0, 1)
+        ]
+        self.simple = not any(self.limits) and not any(
+            self.requirements[k] or hasattr(s, "__probe__") for k, s in fixture.items()
+        )
+
+
+def _plan(provided):
+    plan = provided.__fixture_plan__
+
+    if plan is None or plan.stale(provided):
+        plan = provided.__fixture_plan__ = _Plan(provided)
+
+    return plan
+
+
+def _readiness(provided):
+    return (
+        provided.__fixture_settings__.get("ready_timeout", TIMEOUT),
+        provided.__fixture_settings__.get("ready_backoff", BACKOFF),
+    )
+
+
 def _combine(specs, kwspecs):
     return {f"spec[{i}]": spec for i, spec in enumerate(specs)} | kwspecs
 
 
-def _teardown(values):
-    for v in values:
-        if isinstance(v, tuple) or isinstance(v, list) or isinstance(v, set):
-            _teardown(v)
-        elif isinstance(v, dict):
-            _teardown(v.values())
+def _call(plan, fn, patches, args, other_kwds):
+    from protestr import resolve
+
+    seed = _seed(plan, False)
+    generator = _current.set(_Deferred(seed)) if seed is not None else None
+    token = _target.set(fn) if _target.get() is None else None
+    carried = {}
+
+    try:
+        for i, patch in enumerate(patches):
+            following = _following(patches, i)
+            resolved = _reused(carried)
+            resources = {}
+            kept = {}
+            tracked = True
+
+            try:
+                for snapshots in _restorable(carried):
+                    restore(snapshots)
+
+                for k in patch.ordered:
+                    if k not in resolved:
+                        registry = Registry()
+                        registered = _registry.set(registry)
+
+                        try:
+                            resolved[k] = resolve(patch.fixture[k])
+                        finally:
+                            _registry.reset(registered)
+
+                        if registry.used:
+                            resources[k] = registry.resources
+
+                tracked = any(resources.get(k, True) for k in resolved)
+
+                if tracked:
+                    wait_ready(
+                        probes(patch.fixture, resolved, resources, resolved),
+                        *plan.readiness,
+                        i,
+                    )
+
+                if following is not None:
+                    snapshotted = _snapshots(
+                        patch.fixture, resolved, following, carried, plan.incremental
+                    )
+
+                result = fn(*args, **plan.requested(resolved) | other_kwds)
+
+                if following is not None:
+                    kept = _kept(patch, resolved, following, snapshotted)
+            finally:
+                carried = kept
+
+                if tracked:
+                    teardown_fixture(
+                        _unkept(resolved, kept),
+                        patch.requirements,
+                        i,
+                        [v for v, _ in kept.values()],
+                        resources,
+                        None,
+                        plan.workers,
+                        plan.background,
+                    )
+
+        return result
+    except Exception as e:
+        if seed is not None:
+            _report(e, fn, seed)
+
+        raise
+    finally:
+        if generator:
+            _current.reset(generator)
+
+        if token:
+            _target.reset(token)
+
+
+def _run_in_processes(processes, run, n):
+    job = next(_job_ids)
+    _jobs[job] = copy_context(), run
+
+    try:
+        with ProcessPoolExecutor(processes, get_context("fork")) as pool:
+            futures = [pool.submit(_run_patch, job, i) for i in range(n)]
+            return [future.result() for future in futures][-1]
+    finally:
+        del _jobs[job]
+
+
+def _run_patch(job, i):
+    context, run = _jobs[job]
+
+    try:
+        return context.run(run, i)
+    finally:
+        _finalize_process()
+
+
+def _finalize_process():
+    errors = []
+
+    for finalize in (drain, release, _close_all):
+        with _Collecting(errors):
+            finalize()
+
+    _raise(errors)
+
+
+@contextmanager
+def _seeding(seed, fn):
+    if seed is None:
+        yield None
+        return
+
+    try:
+        with deferred(seed):
+            yield seed
+    except Exception as e:
+        _report(e, fn, seed)
+        raise
+
+
+def _seed(plan, concurrent):
+    if plan.seed is not None or (not concurrent and _target.get() is not None):
+        return plan.seed
+
+    return getrandbits(64)
+
+
+def _report(e, fn, seed):
+    message = f"{fn.__qualname__} failed with seed {seed!r}"
+
+    if hasattr(e, "add_note"):
+        e.add_note(message)
+    else:
+        _log.error(message)
+
+
+def _seeded(path, *keys):
+    return seeded(derive(*path, *keys))
+
+
+def _is_positional(key):
+    return key.startswith("spec[")
+
+
+def _requirements(spec):
+    return getattr(spec, "__requires__", ())
+
+
+def _with_requirements(fixture, keys):
+    required = {}
+
+    while keys:
+        k = keys.pop()
+
+        if k in fixture and k not in required:
+            required[k] = fixture[k]
+            keys.extend(_requirements(fixture[k]))
+
+    return {k: s for k, s in fixture.items() if k in required}
+
+
+def _following(patches, i):
+    return patches[i + 1].fixture if i + 1 < len(patches) else None
+
+
+def _replay(corpus, fn, fixture, resolved, resources, path):
+    if corpus is None:
+        return None, {}
+
+    entry = corpus.entry(fn, path[1], path[0], fixture)
+    replayed = {
+        k: v
+        for k, v in corpus.load(entry).items()
+        if k in fixture and k not in resolved
+    }
+
+    resolved.update(replayed)
+    resources.update(dict.fromkeys(replayed, ()))
+    return entry, replayed
+
+
+def _record(corpus, entry, fixture, resolved, carried):
+    corpus.store(
+        entry,
+        {
+            k: resolved[k]
+            for k, s in fixture.items()
+            if k in resolved and k not in carried and not _requirements(s)
+        },
+    )
+
+
+def _unchanged(fixture, following, k):
+    return following is not None and following.get(k) is fixture[k]
+
+
+def _snapshots(fixture, resolved, following, carried, incremental):
+    snapshots = {k: s for k, (_, s) in carried.items()}
+
+    for k, v in resolved.items():
+        if k in carried or not _unchanged(fixture, following, k):
+            continue
+
+        if getattr(fixture[k], "__reusable__", False) or reusable([v]):
+            snapshots[k] = snapshot([v])
+        elif incremental and _plain(v):
+            if (pristine := _pristine(v)) is not None:
+                snapshots[k] = pristine
+        elif incremental:
+            snapshots[k] = snapshot([v])
+
+    return snapshots
+
+
+class _Pristine:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _plain(value):
+    return not any(
+        _resources([value], hook)
+        for hook in ("__teardown__", "__ready__", "__snapshot__", "__reusable__")
+    )
+
+
+def _pristine(value):
+    try:
+        return _Pristine(deepcopy(value))
+    except _uncopyable:
+        return None
+
+
+def _reused(carried):
+    return {
+        k: deepcopy(s.value) if type(s) is _Pristine else v
+        for k, (v, s) in carried.items()
+    }
+
+
+def _restorable(carried):
+    return [s for _, s in carried.values() if type(s) is not _Pristine]
+
+
+def _kept(patch, resolved, following, snapshots):
+    fixture = patch.fixture
+    kept = {}
+
+    for k in patch.ordered:
+        if (
+            k in snapshots
+            and _unchanged(fixture, following, k)
+            and all(r in kept for r in _requirements(fixture[k]))
+        ):
+            kept[k] = resolved[k], snapshots[k]
+
+    return kept
+
+
+def _unkept(resolved, kept):
+    return {k: v for k, v in resolved.items() if k not in kept}
+
+
+def _ordered(fixture):
+    ordered = {}
+
+    while len(ordered) < len(fixture):
+        keys = [
+            k
+            for k, s in fixture.items()
+            if k not in ordered and all(r in ordered for r in _requirements(s))
+        ]
+
+        if not keys:
+            raise _unresolvable(k for k in fixture if k not in ordered)
+
+        ordered.update(dict.fromkeys(keys))
+
+    return [*ordered]
+
+
+def _unresolvable(keys):
+    return ValueError(
+        f"Cannot resolve {', '.join(keys)}: missing or circular requirements"
+    )
+
+
+async def _resolve_fixture_async(run):
+    from protestr import resolve_async
+
+    fixture, resolved, path = run.fixture, run.resolved, run.path
+    tasks = {}
+
+    async def build(k, spec):
+        if requirements := _requirements(spec):
+            spec = partial(
+                spec,
+                *[await tasks[r] if r in tasks else resolved[r] for r in requirements],
+            )
+            await run.wait_ready_async(requirements)
+
+        run.deadlines.start(k)
+
+        with (
+            _seeded(path, k),
+            observing("resolve", fixture[k], k, path[1]),
+            registering() as registry,
+        ):
+            try:
+                resolved[k] = await run.deadlines.call_async(
+                    k, fixture[k], resolve_async, spec
+                )
+            finally:
+                if registry.used:
+                    run.resources[k] = registry.resources
+
+                if registry.resources:
+                    resolved.setdefault(k, None)
+
+        return resolved[k]
+
+    for k in run.patch.ordered:
+        if k not in resolved:
+            tasks[k] = ensure_future(build(k, fixture[k]))
+
+    if tasks:
+        _, pending = await wait_async(tasks.values(), return_when=FIRST_EXCEPTION)
+
+        for task in pending:
+            task.cancel()
+
+        await gather(*pending, return_exceptions=True)
+
+    for task in tasks.values():
+        if not task.cancelled() and task.exception():
+            raise task.exception()
+
+    await run.wait_ready_async([*resolved])
+
+
+def _resolve_fixture(run, workers):
+    from protestr import resolve
+
+    fixture, resolved, path, deadlines = (
+        run.fixture,
+        run.resolved,
+        run.path,
+        run.deadlines,
+    )
+    pending = {k: s for k, s in fixture.items() if k not in resolved}
+
+    def unblocked():
+        keys = [
+            k
+            for k, s in pending.items()
+            if all(r in resolved for r in _requirements(s))
+        ]
+
+        for k in keys:
+            del pending[k]
+
+        return keys
+
+    def build(k):
+        spec = fixture[k]
+
+        if requirements := _requirements(spec):
+            spec = partial(spec, *(resolved[r] for r in requirements))
+            run.wait_ready(requirements)
+
+        with (
+            run.seeded(k),
+            observing("resolve", fixture[k], k, path[1]),
+            registering() as registry,
+        ):
+            return resolve(spec), registry.resources if registry.used else None
+
+    def bounded(k):
+        deadlines.start(k)
+        return deadlines.call(k, fixture[k], build, k, discard=_discard)
+
+    def store(k, built):
+        resolved[k], found = built
+
+        if found is not None:
+            run.resources[k] = found
+
+    if workers == 1:
+        for k in run.patch.ordered:
+            if k not in resolved:
+                store(k, bounded(k))
+    else:
+        _build_concurrently(
+            build, unblocked, pending, store, workers, deadlines, fixture
+        )
+
+    run.wait_ready([*resolved])
+
+
+def _build_concurrently(build, unblocked, pending, store, workers, deadlines, fixture):
+    running = {}
+    queued = []
+
+    try:
+        while pending or running or queued:
+            queued += unblocked()
+
+            while queued and len(running) < workers:
+                k = queued.pop(0)
+                deadlines.start(k)
+                running[spawn(build, k)] = k
+
+            if not running:
+                raise _unresolvable(pending)
+
+            done, _ = wait(
+                running, deadlines.remaining(running.values()), FIRST_COMPLETED
+            )
+
+            for future in done:
+                store(running.pop(future), future.result())
+
+            if error := deadlines.overdue(running.values(), fixture):
+                raise error
+    finally:
+        wait(running, deadlines.remaining(running.values()))
+
+        for future, k in running.items():
+            if not future.done():
+                abandon(future, _discard)
+            elif not future.exception():
+                store(k, future.result())
+
 
-        if hasattr(v, "__teardown__"):
-            v.__teardown__()
+def _discard(built):
+    value, found = built
+    teardown([value] if found is None else found)
@@ -0,0 +1,116 @@
+from asyncio import gather
+from asyncio import sleep as async_sleep
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from inspect import isawaitable
+from socket import create_connection
+from time import monotonic, sleep
+
+from protestr._hooks import observing
+from protestr._teardown import _complete, _resources_of
+
+TIMEOUT = 30.0
+BACKOFF = (0.01, 1.0)
+
+
+def port_open(host, port, timeout=0.1):
+    try:
+        with create_connection((host, port), timeout):
+            return True
+    except OSError:
+        return False
+
+
+def probes(fixture, resolved, resources, keys):
+    found = []
+
+    for k in keys:
+        if probe := getattr(fixture[k], "__probe__", None):
+            found.append((k, probe, partial(probe, resolved[k])))
+
+        found += [
+            (k, r, r.__ready__)
+            for r in _resources_of(k, resolved, resources, "__ready__")
+        ]
+
+    return found
+
+
+def wait_ready(probes, timeout=TIMEOUT, backoff=BACKOFF, patch=None):
+    deadline = monotonic() + timeout
+
+    if len(probes) < 2:
+        for probe in probes:
+            _poll(*probe, timeout, deadline, backoff, patch)
+
+        return
+
+    with ThreadPoolExecutor(len(probes)) as pool:
+        futures = [
+            pool.submit(
+                copy_context().run, _poll, *probe, timeout, deadline, backoff, patch
+            )
+            for probe in probes
+        ]
+
+        for future in futures:
+            future.result()
+
+
+async def wait_ready_async(probes, timeout=TIMEOUT, backoff=BACKOFF, patch=None):
+    deadline = monotonic() + timeout
+
+    await gather(
+        *(_poll_async(*probe, timeout, deadline, backoff, patch) for probe in probes)
+    )
+
+
+def _poll(key, spec, probe, timeout, deadline, backoff, patch):
+    delay, maximum = backoff
+
+    with observing("ready", spec, key, patch):
+        while True:
+            error = None
+
+            try:
+                if isawaitable(ready := probe()):
+                    ready = _complete(ready)
+
+                if ready:
+                    return
+            except Exception as e:  # noqa: BLE001
+                error = e
+
+            if (remaining := deadline - monotonic()) <= 0:
+                raise _not_ready(key, timeout) from error
+
+            sleep(min(delay, remaining))
+            delay = min(delay * 2, maximum)
+
+
+async def _poll_async(key, spec, probe, timeout, deadline, backoff, patch):
+    delay, maximum = backoff
+
+    with observing("ready", spec, key, patch):
+        while True:
+            error = None
+
+            try:
+                if isawaitable(ready := probe()):
+                    ready = await ready
+
+                if ready:
+                    return
+            except Exception as e:  # noqa: BLE001
+                error = e
+
+            if (remaining := deadline - monotonic()) <= 0:
+                raise _not_ready(key, timeout) from error
+
+            await async_sleep(min(delay, remaining))
+            delay = min(delay * 2, maximum)
+
+
+def _not_ready(key, timeout):
+    return TimeoutError(f"{key} was not ready within {timeout}s")
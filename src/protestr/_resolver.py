@@ -1,36 +1,349 @@
-from random import randint, uniform, choice as randchoice, choices as randchoices
-from string import ascii_letters
+from protestr._rng import randint, uniform, choice as randchoice, choices as randchoices
+from protestr._rng import seeded
+from protestr._teardown import track, _registry
+from protestr._types import _generators as _primitives, _options
+from itertools import chain
+from contextvars import ContextVar
+from asyncio import gather
+from inspect import isawaitable, iscoroutine
 
+_MAX_DEPTH = 200
 
-def resolve(spec):
-    if spec is int:
-        return randint(0, 1000)
+_budget = ContextVar("protestr.budget", default=None)
+_asynchronous = ContextVar("protestr.asynchronous", default=False)
 
-    if spec is float:
-        return uniform(0, 1000)
 
-    if spec is complex:
-        return complex(real=uniform(-1000, 1000), imag=uniform(-1000, 1000))
+def resolve(spec, rng=None, budget=None):
+    if rng is not None:
+        with seeded(rng):
+            return resolve(spec, budget=budget)
 
-    if spec is bool:
-        return randchoice((True, False))
+    if _asynchronous.get():
+        token = _asynchronous.set(False)
 
-    if spec is str:
-        return "".join(randchoices(ascii_letters, k=randint(1, 50)))
+        try:
+            return resolve(spec, budget=budget)
+        finally:
+            _asynchronous.reset(token)
 
-    if isinstance(spec, tuple):
-        return tuple(resolve(x) for x in spec)
+    if budget is not None:
+        token = _budget.set([budget, budget])
+
+        try:
+            return _walk(spec)
+        finally:
+            _budget.reset(token)
+
+    if (registry := _registry.get()) is not None:
+        registry.used = True
+
+    if _budget.get() is not None:
+        return _walk(spec)
+
+    return _resolve(spec, _MAX_DEPTH)
+
+
+async def resolve_async(spec, rng=None):
+    if rng is not None:
+        with seeded(rng):
+            return await resolve_async(spec)
 
-    if isinstance(spec, list):
-        return [resolve(x) for x in spec]
+    if (registry := _registry.get()) is not None:
+        registry.used = True
 
-    if isinstance(spec, set):
-        return {resolve(x) for x in spec}
+    token = _asynchronous.set(True)
 
-    if isinstance(spec, dict):
-        return {resolve(k): resolve(v) for k, v in spec.items()}
+    try:
+        return await _settled(_resolving(spec))
+    finally:
+        _asynchronous.reset(token)
+
+
+def _resolving(spec):
+    if isinstance(spec, type) and spec in _primitives:
+        return _primitives[spec]()
+
+    if isinstance(spec, (tuple, list, set, dict)):
+        values = [*map(_resolving, _items(spec))]
+        pending = [i for i, v in enumerate(values) if type(v) is _Pending]
+
+        if pending:
+            return _Pending(_collecting(spec, values, pending))
+
+        return _collector(spec)(values)
 
     if callable(spec):
-        return resolve(spec())
+        value = spec()
+
+        if isawaitable(value):
+            return _Pending(_awaiting(value))
+
+        return _resolving(value)
+
+    if type(spec) not in _scalars:
+        track(spec)
 
     return spec
+
+
+class _Pending:
+    __slots__ = ("awaitable",)
+
+    def __init__(self, awaitable):
+        self.awaitable = awaitable
+
+
+async def _settled(value):
+    return await value.awaitable if type(value) is _Pending else value
+
+
+async def _awaiting(value):
+    return await _settled(_resolving(await value))
+
+
+async def _collecting(spec, values, pending):
+    settled = await gather(*(values[i].awaitable for i in pending))
+
+    for i, value in zip(pending, settled):
+        values[i] = value
+
+    return _collector(spec)(values)
+
+
+def _resolve(spec, depth):
+    kind = type(spec)
+
+    if kind in _scalars:
+        return spec
+
+    if kind is type and (generate := _primitives.get(spec)) is not None:
+        return generate()
+
+    if not depth:
+        return _walk(spec)
+
+    depth -= 1
+
+    if kind is list:
+        return [
+            generate()
+            if type(x) is type and (generate := _primitives.get(x)) is not None
+            else _resolve(x, depth)
+            for x in spec
+        ]
+
+    if kind is dict:
+        return {_resolve(k, depth): _resolve(v, depth) for k, v in spec.items()}
+
+    if kind is tuple:
+        return (*[_resolve(x, depth) for x in spec],)
+
+    if kind is set:
+        return {_resolve(x, depth) for x in spec}
+
+    if isinstance(spec, type) and spec in _primitives:
+        return _primitives[spec]()
+
+    if isinstance(spec, (tuple, list, set, dict)):
+        return _collector(spec)([_resolve(x, depth) for x in _items(spec)])
+
+    if callable(spec):
+        return _resolve(spec(), depth)
+
+    return _leaf(spec)
+
+
+def _walk(spec):
+    budget = _budget.get()
+    values = []
+    work = [spec]
+    collecting = []
+    active = set()
+
+    while work:
+        spec = work.pop()
+
+        if spec is _collect:
+            spec, start, collect = collecting.pop()
+            value = collect(values[start:])
+            del values[start:]
+            active.discard(id(spec))
+            values.append(value)
+            continue
+
+        if budget is not None:
+            budget[0] -= 1
+
+            if budget[0] < 0:
+                raise ValueError(f"Resolution exceeded the budget of {budget[1]} specs")
+
+        kind = type(spec)
+
+        if kind in _scalars:
+            values.append(spec)
+        elif isinstance(spec, type) and spec in _primitives:
+            values.append(_primitives[spec]())
+        elif isinstance(spec, (tuple, list, set, dict)):
+            if id(spec) in active:
+                raise _circular(spec)
+
+            active.add(id(spec))
+            collecting.append((spec, len(values), _collector(spec)))
+            work.append(_collect)
+            work += reversed(_items(spec))
+        elif callable(spec):
+            value = _call(spec, budget)
+
+            if type(value) in _scalars:
+                values.append(value)
+            else:
+                work.append(value)
+        else:
+            values.append(_leaf(spec))
+
+    return values[0]
+
+
+def _call(spec, budget):
+    value = spec()
+    calls = None
+
+    while _callable(value):
+        if budget is not None:
+            budget[0] -= 1
+
+            if budget[0] < 0:
+                raise ValueError(f"Resolution exceeded the budget of {budget[1]} specs")
+
+        if calls is None:
+            calls = {id(spec): spec}
+
+        if id(value) in calls:
+            raise _circular(value)
+
+        calls[id(value)] = value
+        value = value()
+
+    return value
+
+
+def _callable(value):
+    return (
+        callable(value)
+        and not (isinstance(value, type) and value in _primitives)
+        and not isinstance(value, (tuple, list, set, dict))
+    )
+
+
+def _circular(spec):
+    return ValueError(f"Cannot resolve circular spec {type(spec).__name__}")
+
+
+_collect = object()
+
+
+def _constant(spec):
+    if type(spec) in _scalars:
+        return True
+
+    if isinstance(spec, tuple):
+        return all(map(_constant, spec))
+
+    return not (
+        callable(spec)
+        or isinstance(spec, (list, set, dict))
+        or hasattr(spec, "__teardown__")
+        or hasattr(spec, "__ready__")
+        or _awaitable(spec)
+    )
+
+
+def _int():
+    return randint(*_options[int]["bounds"])
+
+
+def _float():
+    return uniform(*_options[float]["bounds"])
+
+
+def _complex():
+    lo, hi = _options[complex]["bounds"]
+    return complex(real=uniform(lo, hi), imag=uniform(lo, hi))
+
+
+def _bool():
+    return randchoice((True, False))
+
+
+def _str():
+    options = _options[str]
+    return "".join(randchoices(options["alphabet"], k=randint(*options["length"])))
+
+
+_primitives.update(
+    {int: _int, float: _float, complex: _complex, bool: _bool, str: _str}
+)
+
+_scalars = {int, float, complex, bool, str, bytes, type(None)}
+
+
+def _awaitable(value):
+    return hasattr(type(value), "__await__")
+
+
+def _unawaited(value):
+    if iscoroutine(value):
+        value.close()
+
+    return TypeError(
+        f"Cannot resolve {getattr(value, '__qualname__', value)!s} synchronously, "
+        "use resolve_async() instead"
+    )
+
+
+def _leaf(value):
+    if type(value) not in _scalars and not track(value) and _awaitable(value):
+        raise _unawaited(value)
+
+    return value
+
+
+def _items(spec):
+    if isinstance(spec, (tuple, list)):
+        return spec
+
+    return [*_dict_items(spec)] if isinstance(spec, dict) else [*spec]
+
+
+def _dict_items(spec):
+    return chain.from_iterable(spec.items())
+
+
+def _tuple_collect(values):
+    return (*values,)
+
+
+def _set_collect(values):
+    return {*values}
+
+
+def _dict_copy(values):
+    return dict(zip(values[::2], values[1::2]))
+
+
+def _collector(spec):
+    if (collect := _collects.get(type(spec))) is not None:
+        return collect
+
+    for kind, collect in _collectors:
+        if isinstance(spec, kind):
+            return collect
+
+
+_collectors = [
+    (tuple, _tuple_collect),
+    (list, list),
+    (set, _set_collect),
+    (dict, _dict_copy),
+]
+_collects = dict(_collectors)
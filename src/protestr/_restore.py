@@ -0,0 +1,34 @@
+from inspect import isawaitable
+
+from protestr._teardown import _complete, _resources
+
+
+def reusable(values):
+    resources = [
+        *_resources(values),
+        *_resources(values, "__snapshot__"),
+        *_resources(values, "__reusable__"),
+    ]
+
+    return bool(resources) and all(
+        getattr(r, "__reusable__", False)
+        or hasattr(r, "__snapshot__")
+        and hasattr(r, "__restore__")
+        for r in resources
+    )
+
+
+def snapshot(values):
+    return [(r, r.__snapshot__()) for r in _resources(values, "__snapshot__")]
+
+
+def restore(snapshots):
+    for r, state in snapshots:
+        if isawaitable(result := r.__restore__(state)):
+            _complete(result)
+
+
+async def restore_async(snapshots):
+    for r, state in snapshots:
+        if isawaitable(result := r.__restore__(state)):
+            await result
@@ -0,0 +1,105 @@
+import random as _random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+_Random = _random.Random
+_current = ContextVar("protestr.rng", default=_random._inst)
+_lock = Lock()
+
+
+@contextmanager
+def seeded(seed):
+    token = _current.set(
+        seed if isinstance(seed, _random.Random) else _random.Random(seed)
+    )
+
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def derive(seed, *path):
+    return _random.Random("/".join(map(str, (seed, *path))))
+
+
+@contextmanager
+def deferred(seed):
+    token = _current.set(_Deferred(seed))
+
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current():
+    return _generator()
+
+
+def randint(a, b):
+    rng = _current.get()
+
+    if type(rng) is _Random and type(a) is int and type(b) is int and a <= b:
+        return a + rng._randbelow(b - a + 1)
+
+    return _generator().randint(a, b)
+
+
+def uniform(a, b):
+    rng = _current.get()
+
+    if type(rng) is _Random:
+        return a + (b - a) * rng.random()
+
+    return _generator().uniform(a, b)
+
+
+def random():
+    return _generator().random()
+
+
+def getrandbits(k):
+    return _generator().getrandbits(k)
+
+
+def choice(seq):
+    rng = _current.get()
+
+    if type(rng) is _Random and (n := len(seq)):
+        return seq[rng._randbelow(n)]
+
+    return _generator().choice(seq)
+
+
+def choices(population, weights=None, *, cum_weights=None, k=1):
+    return _generator().choices(population, weights, cum_weights=cum_weights, k=k)
+
+
+def sample(population, k):
+    return _generator().sample(population, k)
+
+
+class _Deferred:
+    __slots__ = ("rng", "seed")
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.rng = None
+
+
+def _generator():
+    rng = _current.get()
+
+    if type(rng) is not _Deferred:
+        return rng
+
+    if rng.rng is None:
+        with _lock:
+            if rng.rng is None:
+                seed = rng.seed
+                rng.rng = _Random(seed) if type(seed) is int else derive(seed)
+
+    _current.set(rng.rng)
+    return rng.rng
@@ -0,0 +1,186 @@
+import os
+from asyncio import wrap_future
+from atexit import register
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from threading import Lock, RLock
+
+from protestr._restore import restore, snapshot
+from protestr._teardown import (
+    _Collecting,
+    _raise,
+    _resources,
+    registering,
+    retain,
+    teardown,
+    track,
+    unretain,
+)
+
+SCOPES = ("function", "class", "module", "session")
+
+_target = ContextVar("protestr.target", default=None)
+
+_instances = {}
+_keys = {}
+_lock = RLock()
+
+
+@contextmanager
+def targeting(fn):
+    token = _target.set(fn) if _target.get() is None else None
+
+    try:
+        yield
+    finally:
+        if token:
+            _target.reset(token)
+
+
+def acquire(spec, scope, resolved=()):
+    from protestr._resolver import _asynchronous, resolve, resolve_async
+
+    fn = _target.get()
+    built = partial(spec, *resolved) if resolved else spec
+    asynchronous = _asynchronous.get()
+
+    if scope == "function" or fn is None:
+        return resolve_async(built) if asynchronous else resolve(built)
+
+    key = (
+        (fn.__module__, fn.__qualname__.rpartition(".")[0])
+        if scope == "class"
+        else fn.__module__
+        if scope == "module"
+        else None
+    )
+
+    instance, owner = _claim(spec, scope, key)
+
+    if asynchronous:
+        return _acquire_async(instance, owner, built)
+
+    if not owner:
+        return _reuse(instance, instance.future.result())
+
+    with registering() as registry:
+        try:
+            value = resolve(built)
+        except BaseException as e:
+            _abandon(instance, e)
+            raise
+
+    return _keep(instance, value, registry.resources)
+
+
+async def _acquire_async(instance, owner, built):
+    from protestr._resolver import resolve_async
+
+    if not owner:
+        return _reuse(instance, await wrap_future(instance.future))
+
+    with registering() as registry:
+        try:
+            value = await resolve_async(built)
+        except BaseException as e:
+            _abandon(instance, e)
+            raise
+
+    return _keep(instance, value, registry.resources)
+
+
+class _Instance:
+    __slots__ = ("future", "lock", "resources", "scope", "snapshots", "spec")
+
+    def __init__(self, scope, spec):
+        self.scope = scope
+        self.spec = spec
+        self.future = Future()
+        self.lock = Lock()
+        self.resources = ()
+        self.snapshots = None
+
+
+def _claim(spec, scope, key):
+    with _lock:
+        if scope in _keys and _keys[scope] != key:
+            release(scope)
+
+        _keys[scope] = key
+        instances = _instances.setdefault(scope, {})
+
+        if (instance := instances.get(id(spec))) is not None:
+            return instance, False
+
+        instance = instances[id(spec)] = _Instance(scope, spec)
+        return instance, True
+
+
+def _keep(instance, value, resources):
+    with _lock:
+        kept = _instances.get(instance.scope, {}).get(id(instance.spec)) is instance
+
+        if kept:
+            instance.resources = resources
+            instance.snapshots = snapshot([value])
+            retain(resources)
+
+    if not kept:
+        for resource in resources:
+            track(resource)
+
+    instance.future.set_result(value)
+    return value
+
+
+def _abandon(instance, error):
+    with _lock:
+        instances = _instances.get(instance.scope, {})
+
+        if instances.get(id(instance.spec)) is instance:
+            del instances[id(instance.spec)]
+
+    instance.future.set_exception(error)
+
+
+def _reuse(instance, value):
+    with instance.lock:
+        if instance.snapshots is not None:
+            restore(instance.snapshots)
+
+        for resource in _resources([value], "__reset__"):
+            resource.__reset__()
+
+    return value
+
+
+def release(*scopes):
+    errors = []
+
+    with _lock:
+        for scope in scopes or SCOPES:
+            _keys.pop(scope, None)
+
+            for instance in reversed([*_instances.pop(scope, {}).values()]):
+                unretain(instance.resources)
+
+                with _Collecting(errors):
+                    teardown(instance.resources)
+
+    _raise(errors)
+
+
+register(release)
+
+
+def _after_fork():
+    global _lock
+    _lock = RLock()
+    _instances.clear()
+    _keys.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -1,11 +1,31 @@
-from random import (
+from protestr._rng import (
     randint,
     uniform,
     sample as randsample,
     choice as randchoice,
     choices as randchoices,
+    random,
+    getrandbits,
+    seeded,
 )
+from array import array
+from collections.abc import Sequence
+from functools import partial
+from itertools import repeat
+from mmap import mmap, ACCESS_READ
+import os
+from random import Random
+from threading import Lock
+from weakref import finalize
 from protestr import resolve
+from protestr._teardown import teardown
+from protestr._scopes import acquire, SCOPES
+from protestr._pool import Pool
+from protestr._allocator import allocate_port, allocate_slot
+from protestr._batch import resolve_many
+
+_MAX_STALE = 10
+_MARKERS = ("__requires__", "__probe__", "__deadline__", "__reusable__")
 
 
 def between(x, y):
@@ -17,16 +37,52 @@ def between(x, y):
 
         return uniform(m, n)
 
+    def population():
+        m, n = sorted((resolve(x), resolve(y)))
+
+        if isinstance(m, int) and isinstance(n, int):
+            return range(m, n + 1)
+
+    if _is_scalar(x) and _is_scalar(y):
+        spec.__resolve_many__ = lambda n: _between_many(x, y, n)
+
+    spec.__population__ = population
     return spec
 
 
+def _between_many(x, y, n):
+    lo, hi = sorted((x, y))
+
+    if isinstance(lo, int) and isinstance(hi, int):
+        return randchoices(range(lo, hi + 1), k=n)
+
+    return [lo + (hi - lo) * random() for _ in repeat(None, n)]
+
+
 def choice(*elems):
-    return lambda: randchoice(resolve(_unpack_if_single(elems)))
+    elems = _unpack_if_single(elems)
+
+    def spec():
+        return randchoice(_population(elems))
+
+    def resolve_many(n):
+        if (population := _lazy(elems)) is not None:
+            return randchoices(population, k=n)
+
+        if isinstance(elems, (tuple, list, str)) and all(map(_is_scalar, elems)):
+            return randchoices(elems, k=n)
+
+        return [resolve(spec) for _ in repeat(None, n)]
+
+    spec.__resolve_many__ = resolve_many
+    return spec
 
 
 def sample(*elems, k):
+    elems = _unpack_if_single(elems)
+
     def spec():
-        resolved_elems = resolve(_unpack_if_single(elems))
+        resolved_elems = _population(elems)
 
         return _cast(
             result=randsample(
@@ -40,8 +96,10 @@ def sample(*elems, k):
 
 
 def choices(*elems, k):
+    elems = _unpack_if_single(elems)
+
     def spec():
-        resolved_elems = resolve(_unpack_if_single(elems))
+        resolved_elems = _population(elems)
 
         return _cast(
             result=randchoices(
@@ -54,8 +112,267 @@ def choices(*elems, k):
     return spec
 
 
+def unique(spec, k, key=None):
+    def distinct():
+        n = resolve(k)
+
+        if (population := _lazy(spec)) is not None:
+            return randsample(population, n)
+
+        found = {}
+        stale = 0
+
+        while len(found) < n:
+            size = len(found)
+
+            for value in resolve_many(spec, n):
+                found.setdefault(value if key is None else key(value), value)
+
+            stale = 0 if len(found) > size else stale + 1
+
+            if stale == _MAX_STALE:
+                raise ValueError(f"Cannot generate {n} distinct values of {spec!r}")
+
+        return [*found.values()][:n]
+
+    return distinct
+
+
+def lines(path, encoding="utf-8"):
+    return _Lines(path, encoding)
+
+
+class _Lines(Sequence):
+    def __init__(self, path, encoding):
+        self.path = os.fspath(path)
+        self.encoding = encoding
+        self._map = self._offsets = self._closer = None
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._index()) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        offsets = self._index()
+
+        if not -len(self) <= i < len(self):
+            raise IndexError("line index out of range")
+
+        i %= len(self)
+        line = self._map[offsets[i] : offsets[i + 1] - 1].decode(self.encoding)
+        return line.removesuffix("\r")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __fingerprint__(self):
+        stat = os.stat(self.path)
+        return self.path, self.encoding, stat.st_size, stat.st_mtime_ns
+
+    def __repr__(self):
+        return f"lines({self.path!r})"
+
+    def close(self):
+        with self._lock:
+            if self._closer is not None:
+                self._closer()
+
+            self._map = self._offsets = self._closer = None
+
+    def _index(self):
+        if self._offsets is None:
+            with self._lock:
+                if self._offsets is None:
+                    self._map, self._offsets, self._closer = _mapped(self, self.path)
+
+        return self._offsets
+
+
+def _mapped(owner, path):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data = mmap(f.fileno(), 0, access=ACCESS_READ) if size else b""
+
+    offsets = array("q", [0])
+    i = data.find(b"\n")
+
+    while i != -1:
+        offsets.append(i + 1)
+        i = data.find(b"\n", i + 1)
+
+    if offsets[-1] != size:
+        offsets.append(size + 1)
+
+    return data, offsets, finalize(owner, data.close) if size else None
+
+
 def recipe(*specs, then):
-    return lambda: then(resolve(_unpack_if_single(specs)))
+    specs = _unpack_if_single(specs)
+    return lambda: then(resolve(specs))
+
+
+def uses(*keys, then):
+    def spec(*resolved):
+        return then(*resolved)
+
+    spec.__requires__ = keys
+    return spec
+
+
+def ready(spec, probe):
+    def probed(*resolved):
+        return _forward(spec, resolved)
+
+    return _marked(probed, spec, __probe__=probe)
+
+
+def deadline(spec, seconds=None, teardown=None):
+    def bounded(*resolved):
+        return _forward(spec, resolved)
+
+    return _marked(bounded, spec, __deadline__=(seconds, teardown))
+
+
+def reusable(spec):
+    def reused(*resolved):
+        return _forward(spec, resolved)
+
+    return _marked(reused, spec, __reusable__=True)
+
+
+def scoped(spec, scope):
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {', '.join(SCOPES)}, not {scope!r}")
+
+    def shared(*resolved):
+        return acquire(spec, scope, resolved)
+
+    return _marked(shared, spec)
+
+
+def _forward(spec, resolved):
+    return partial(spec, *resolved) if resolved else spec
+
+
+def _marked(wrapper, spec, **markers):
+    for marker in _MARKERS:
+        if hasattr(spec, marker):
+            setattr(wrapper, marker, getattr(spec, marker))
+
+    for marker, value in markers.items():
+        setattr(wrapper, marker, value)
+
+    wrapper.__wrapped__ = spec
+    return wrapper
+
+
+def pooled(spec, size=1, max_idle=None):
+    return Pool(spec, size, max_idle)
+
+
+def port(host=""):
+    return partial(allocate_port, host)
+
+
+def slot(name):
+    return partial(allocate_slot, name)
+
+
+def stream(spec, n=None, chunk=None):
+    return lambda: _Stream(spec, resolve(n), chunk)
+
+
+class _Stream:
+    def __init__(self, spec, n, chunk):
+        self._items = _generate(spec, n, chunk, Random(getrandbits(64)))
+        self._used = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._release()
+        self._used = [next(self._items)]
+        return self._used[0]
+
+    def __teardown__(self):
+        self._items.close()
+        self._release()
+
+    def _release(self):
+        used, self._used = self._used, []
+        teardown(used)
+
+
+def _generate(spec, n, chunk, rng):
+    while n is None or n > 0:
+        size = chunk if n is None else min(chunk or 1, n)
+
+        with seeded(rng):
+            item = resolve(spec) if chunk is None else resolve_many(spec, size)
+
+        if n is not None:
+            n -= size
+
+        yield item
+
+
+def lazy(spec):
+    return lambda: _Lazy(spec)
+
+
+class _Lazy:
+    __slots__ = ("_lazy_lock", "_lazy_spec", "_lazy_value")
+
+    def __init__(self, spec):
+        self._lazy_spec = spec
+        self._lazy_value = _unresolved
+        self._lazy_lock = Lock()
+
+    def __getattr__(self, name):
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+
+        with self._lazy_lock:
+            if self._lazy_value is _unresolved:
+                self._lazy_value = resolve(self._lazy_spec)
+
+        return getattr(self._lazy_value, name)
+
+    def __teardown__(self):
+        if self._lazy_value is not _unresolved:
+            teardown([self._lazy_value])
+
+
+_unresolved = object()
+
+
+def _population(elems):
+    if not hasattr(elems, "__population__"):
+        return resolve(elems)
+
+    if (population := elems.__population__()) is None:
+        raise TypeError("Cannot draw from a continuous interval")
+
+    return population
+
+
+def _lazy(elems):
+    if isinstance(elems, (range, _Lines)):
+        return elems
+
+    if hasattr(elems, "__population__"):
+        return elems.__population__()
+
+
+def _is_scalar(x):
+    return type(x) in (int, float, complex, bool, str, type(None))
 
 
 def _cast(result, elemtype):
@@ -0,0 +1,287 @@
+import os
+from asyncio import gather, get_running_loop, run
+from atexit import register
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from inspect import isawaitable
+from threading import Lock
+
+from protestr._deadlines import Deadlines, spawn
+from protestr._hooks import _hooks, observing
+
+
+class TeardownError(Exception):
+    def __init__(self, errors):
+        super().__init__(*errors)
+        self.errors = errors
+
+    def __str__(self):
+        return f"{len(self.errors)} teardowns failed: " + "; ".join(
+            f"{type(e).__name__}: {e}" for e in self.errors
+        )
+
+
+class _Collecting:
+    __slots__ = ("errors",)
+
+    def __init__(self, errors):
+        self.errors = errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, e, traceback):
+        if isinstance(e, Exception):
+            self.errors.append(e)
+            return True
+
+        return False
+
+
+class Registry:
+    __slots__ = ("resources", "used")
+
+    def __init__(self):
+        self.resources = []
+        self.used = False
+
+
+@contextmanager
+def registering():
+    token = _registry.set(Registry())
+
+    try:
+        yield _registry.get()
+    finally:
+        _registry.reset(token)
+
+
+def track(value):
+    if not hasattr(value, "__teardown__") and not hasattr(value, "__ready__"):
+        return False
+
+    if (registry := _registry.get()) is not None:
+        registry.resources.append(value)
+
+    return True
+
+
+def teardown(values):
+    _raise(_teardown_each(_unseen(_resources(values), {*_retained})))
+
+
+def retain(values):
+    _retained.update(map(id, _resources(values)))
+
+
+def unretain(values):
+    _retained.difference_update(map(id, _resources(values)))
+
+
+def teardown_fixture(
+    resolved,
+    requirements,
+    patch=None,
+    keep=(),
+    resources=None,
+    deadlines=None,
+    workers=1,
+    background=False,
+):
+    levels = _levels(resolved, requirements, keep, resources)
+
+    if background:
+        _submit(copy_context().run, _teardown_levels, levels, workers, patch, deadlines)
+    else:
+        _raise(_teardown_levels(levels, workers, patch, deadlines))
+
+
+async def teardown_fixture_async(
+    resolved, requirements, patch=None, keep=(), resources=None, deadlines=None
+):
+    errors = []
+
+    for level in _levels(resolved, requirements, keep, resources):
+        for unit_errors in await gather(
+            *(_teardown_each_async(unit, k, patch, deadlines) for k, unit in level)
+        ):
+            errors += unit_errors
+
+    _raise(errors)
+
+
+def drain():
+    with _background_lock:
+        pending = [*_pending]
+        _pending.clear()
+
+    _raise([e for future in pending for e in future.result()])
+
+
+_background = None
+_background_lock = Lock()
+_pending = []
+_retained = set()
+_registry = ContextVar("protestr.registry", default=None)
+_unbounded = Deadlines()
+
+register(drain)
+
+
+def _after_fork():
+    global _background, _background_lock
+    _background = None
+    _background_lock = Lock()
+    _pending.clear()
+    _retained.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _submit(fn, *args):
+    global _background
+
+    with _background_lock:
+        if _background is None:
+            _background = ThreadPoolExecutor(1, thread_name_prefix="protestr")
+
+        _pending.append(_background.submit(fn, *args))
+
+
+def _levels(resolved, requirements, keep=(), resources=None):
+    resources = resources or {}
+    remaining = [*reversed(resolved)]
+    levels = []
+
+    while remaining:
+        required = {r for k in remaining for r in requirements.get(k, ())}
+        level = [k for k in remaining if k not in required] or remaining
+        remaining = [k for k in remaining if k not in level]
+        levels.append([(k, _resources_of(k, resolved, resources)) for k in level])
+
+    seen = {*_retained, *map(id, _resources(keep))}
+
+    for level in reversed(levels):
+        for _, unit in level:
+            unit[:] = _unseen(unit, seen)
+
+    return levels
+
+
+def _resources_of(k, resolved, resources, hook="__teardown__"):
+    if k in resources:
+        return [r for r in resources[k] if hasattr(r, hook)]
+
+    return _resources([resolved[k]], hook)
+
+
+def _unseen(resources, seen):
+    unseen = []
+
+    for r in resources:
+        if id(r) not in seen:
+            seen.add(id(r))
+            unseen.append(r)
+
+    return unseen
+
+
+def _teardown_levels(levels, workers, patch=None, deadlines=None):
+    errors = []
+
+    for level in levels:
+        if workers == 1 or len(level) < 2:
+            for k, unit in level:
+                errors += _teardown_each(unit, k, patch, deadlines)
+        else:
+            with ThreadPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(
+                        copy_context().run, _teardown_each, unit, k, patch, deadlines
+                    )
+                    for k, unit in level
+                ]
+
+                for future in futures:
+                    errors += future.result()
+
+    return errors
+
+
+def _teardown_each(resources, key=None, patch=None, deadlines=None):
+    deadlines = deadlines or _unbounded
+    deadlines.start(key)
+    bounded = deadlines.bound(key) is not None
+    errors = []
+
+    if not bounded and not _hooks:
+        for r in reversed(resources):
+            with _Collecting(errors):
+                _teardown_one(r)
+
+        return errors
+
+    for r in reversed(resources):
+        with _Collecting(errors), observing("teardown", r, key, patch):
+            if bounded:
+                deadlines.call(key, r, _teardown_one, r)
+            else:
+                _teardown_one(r)
+
+    return errors
+
+
+def _teardown_one(resource):
+    if (result := resource.__teardown__()) is not None and isawaitable(result):
+        _complete(result)
+
+
+async def _teardown_each_async(resources, key=None, patch=None, deadlines=None):
+    deadlines = deadlines or _unbounded
+    deadlines.start(key)
+    errors = []
+
+    for r in reversed(resources):
+        with _Collecting(errors), observing("teardown", r, key, patch):
+            await deadlines.call_async(key, r, r.__teardown__)
+
+    return errors
+
+
+async def _awaited(awaitable):
+    return await awaitable
+
+
+def _complete(awaitable):
+    try:
+        get_running_loop()
+    except RuntimeError:
+        return run(_awaited(awaitable))
+
+    return spawn(run, _awaited(awaitable)).result()
+
+
+def _resources(values, hook="__teardown__", found=None):
+    found = [] if found is None else found
+
+    for v in values:
+        if isinstance(v, (tuple, list, set)):
+            _resources(v, hook, found)
+        elif isinstance(v, dict):
+            _resources(v.values(), hook, found)
+
+        if hasattr(v, hook):
+            found.append(v)
+
+    return found
+
+
+def _raise(errors):
+    if len(errors) == 1:
+        raise errors[0]
+
+    if errors:
+        raise TeardownError(errors)
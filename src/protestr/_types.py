@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import accumulate, repeat
+from string import ascii_letters
+from uuid import UUID
+
+from protestr._rng import choices as randchoices
+from protestr._rng import getrandbits, randint
+
+
+def register(kind, generate, generate_many=None):
+    _generators[kind] = generate
+    _bulk[kind] = generate_many or _repeated(generate)
+
+
+def unregister(kind):
+    _generators.pop(kind, None)
+    _bulk.pop(kind, None)
+    _options.pop(kind, None)
+
+
+def configure(kind, **options):
+    current = _options.get(kind, {})
+
+    if unknown := options.keys() - current.keys():
+        raise TypeError(
+            f"{kind.__name__} has no option{'s' * (len(unknown) > 1)} "
+            f"{', '.join(sorted(unknown))}"
+        )
+
+    previous = {**current}
+    current.update(options)
+    return previous
+
+
+def _repeated(generate):
+    return lambda n, rng: [generate() for _ in repeat(None, n)]
+
+
+def _lengths(kind, n, rng):
+    lo, hi = _options[kind]["length"]
+
+    if rng is not None:
+        return rng.integers(lo, hi, size=n, endpoint=True).tolist()
+
+    return randchoices(range(lo, hi + 1), k=n)
+
+
+def _slices(buffer, lengths):
+    ends = [*accumulate(lengths)]
+    return [buffer[i:j] for i, j in zip([0, *ends], ends)]
+
+
+def _random_bytes(n):
+    return getrandbits(8 * n).to_bytes(n, "little")
+
+
+def _bytes():
+    return _random_bytes(randint(*_options[bytes]["length"]))
+
+
+def _bytes_many(n, rng, kind=bytes):
+    lengths = _lengths(kind, n, rng)
+    total = sum(lengths)
+    buffer = rng.bytes(total) if rng is not None else _random_bytes(total)
+    return _slices(kind(buffer), lengths)
+
+
+def _bytearray():
+    return bytearray(_random_bytes(randint(*_options[bytearray]["length"])))
+
+
+def _bytearray_many(n, rng):
+    return _bytes_many(n, rng, bytearray)
+
+
+def _datetime():
+    lo, hi = _options[datetime]["bounds"]
+    return lo + timedelta(microseconds=randint(0, (hi - lo) // _microsecond))
+
+
+def _datetime_many(n, rng):
+    lo, hi = _options[datetime]["bounds"]
+    span = (hi - lo) // _microsecond
+
+    if rng is not None:
+        offsets = rng.integers(0, span, size=n, endpoint=True).tolist()
+    else:
+        offsets = [randint(0, span) for _ in repeat(None, n)]
+
+    return [lo + timedelta(microseconds=x) for x in offsets]
+
+
+def _uuid():
+    return UUID(int=getrandbits(128), version=4)
+
+
+def _uuid_many(n, rng):
+    buffer = rng.bytes(16 * n) if rng is not None else _random_bytes(16 * n)
+    return [UUID(bytes=buffer[i : i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+def _decimal():
+    lo, hi, places = _decimal_bounds()
+    return Decimal(randint(lo, hi)).scaleb(-places)
+
+
+def _decimal_many(n, rng):
+    lo, hi, places = _decimal_bounds()
+    return [Decimal(randint(lo, hi)).scaleb(-places) for _ in repeat(None, n)]
+
+
+def _decimal_bounds():
+    options = _options[Decimal]
+    places = options["places"]
+    lo, hi = (int(Decimal(x).scaleb(places)) for x in options["bounds"])
+    return lo, hi, places
+
+
+_microsecond = timedelta(microseconds=1)
+
+_generators = {
+    bytes: _bytes,
+    bytearray: _bytearray,
+    datetime: _datetime,
+    UUID: _uuid,
+    Decimal: _decimal,
+}
+
+_bulk = {
+    bytes: _bytes_many,
+    bytearray: _bytearray_many,
+    datetime: _datetime_many,
+    UUID: _uuid_many,
+    Decimal: _decimal_many,
+}
+
+_options = {
+    int: {"bounds": (0, 1000)},
+    float: {"bounds": (0, 1000)},
+    complex: {"bounds": (-1000, 1000)},
+    str: {"length": (1, 50), "alphabet": ascii_letters},
+    bytes: {"length": (1, 50)},
+    bytearray: {"length": (1, 50)},
+    datetime: {
+        "bounds": (
+            datetime(2000, 1, 1, tzinfo=timezone.utc),
+            datetime(2050, 1, 1, tzinfo=timezone.utc),
+        )
+    },
+    Decimal: {"bounds": (0, 1000), "places": 2},
+}
@@ -0,0 +1,3 @@
+from protestr._hooks import Collector, Event, add_hook, remove_hook
+
+__all__ = ["Collector", "Event", "add_hook", "remove_hook"]
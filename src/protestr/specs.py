@@ -1,7 +1,39 @@
 from protestr._specs import (
-    between as between,
-    choice as choice,
-    sample as sample,
-    choices as choices,
-    recipe as recipe,
+    between,
+    choice,
+    choices,
+    deadline,
+    lazy,
+    lines,
+    pooled,
+    port,
+    ready,
+    recipe,
+    reusable,
+    sample,
+    scoped,
+    slot,
+    stream,
+    unique,
+    uses,
 )
+
+__all__ = [
+    "between",
+    "choice",
+    "choices",
+    "deadline",
+    "lazy",
+    "lines",
+    "pooled",
+    "port",
+    "ready",
+    "recipe",
+    "reusable",
+    "sample",
+    "scoped",
+    "slot",
+    "stream",
+    "unique",
+    "uses",
+]
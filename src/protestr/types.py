@@ -0,0 +1,3 @@
+from protestr._types import configure, register, unregister
+
+__all__ = ["configure", "register", "unregister"]
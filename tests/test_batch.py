@@ -0,0 +1,117 @@
+import unittest
+from array import array
+from collections import namedtuple
+from string import ascii_letters
+from unittest.mock import MagicMock
+
+from protestr import provide, resolve_many
+from protestr.specs import between, choice, uses
+
+
+class Resource:
+    torndown = False
+
+    def __teardown__(self):
+        self.torndown = True
+
+
+class TestBatch(unittest.TestCase):
+    @provide(n=between(1, 100))
+    def test_resolve_many_should_generate_primitives(self, n):
+        rows = resolve_many((int, float, complex, bool, str), n, numpy=False)
+
+        self.assertEqual(len(rows), n)
+
+        for intgr, real, cmplx, bln, text in rows:
+            self.assertIsInstance(intgr, int)
+            self.assertTrue(0 <= intgr <= 1000)
+            self.assertIsInstance(real, float)
+            self.assertTrue(0 <= real <= 1000)
+            self.assertIsInstance(cmplx, complex)
+            self.assertIsInstance(bln, bool)
+            self.assertTrue(1 <= len(text) <= 50)
+            self.assertTrue(set(text) <= set(ascii_letters))
+
+    @provide(n=between(2, 10), x=int)
+    def test_resolve_many_should_resolve_collections(self, n, x):
+        spec = {"xs": [x, between(x, x)], "ys": {x}, "zs": (x,)}
+
+        rows = resolve_many(spec, n, numpy=False)
+
+        self.assertEqual(rows, [{"xs": [x, x], "ys": {x}, "zs": (x,)}] * n)
+        self.assertIsNot(rows[0]["xs"], rows[-1]["xs"])
+
+    @provide(n=between(1, 10), x=int)
+    def test_resolve_many_should_call_callables(self, n, x):
+        fn = MagicMock(return_value=x)
+
+        self.assertEqual(resolve_many(fn, n), [x] * n)
+        self.assertEqual(fn.call_count, n)
+
+    @provide(n=between(1, 10), x=str)
+    def test_resolve_many_should_use_batch_protocol(self, n, x):
+        spec = MagicMock()
+        spec.__resolve_many__ = MagicMock(return_value=[x] * n)
+
+        self.assertEqual(resolve_many([spec], n), [[x]] * n)
+
+        spec.__resolve_many__.assert_called_once_with(n)
+        spec.assert_not_called()
+
+    @provide(n=between(1, 10))
+    def test_resolve_many_should_return_columns(self, n):
+        spec = {"id": between(1, 99), "data": (float, choice("a", "b"))}
+
+        columns = resolve_many(spec, n, columns=True, numpy=False)
+
+        self.assertIsInstance(columns["id"], array)
+        self.assertEqual(len(columns["id"]), n)
+        self.assertTrue(all(1 <= x <= 99 for x in columns["id"]))
+
+        reals, chars = columns["data"]
+
+        self.assertIsInstance(reals, array)
+        self.assertEqual(len(reals), n)
+        self.assertEqual(len(chars), n)
+        self.assertTrue(set(chars) <= {"a", "b"})
+
+    @provide(n=between(1, 100))
+    def test_resolve_many_should_build_provided_targets_by_column(self, n):
+        ids = MagicMock()
+        ids.__resolve_many__ = MagicMock(side_effect=lambda n: [*range(n)])
+
+        @provide(
+            id=ids,
+            name=uses("id", then=lambda id: f"user{id}"),
+            resource=Resource,
+        )
+        class User:
+            def __init__(self, id, name, resource):
+                self.id = id
+                self.name = name
+                self.resource = resource
+
+        users = resolve_many(User, n)
+
+        ids.__resolve_many__.assert_called_once_with(n)
+        self.assertEqual(
+            [(u.id, u.name) for u in users], [(i, f"user{i}") for i in range(n)]
+        )
+        self.assertTrue(all(u.resource.torndown for u in users))
+
+        Record = namedtuple("Record", "name id")
+        records = resolve_many(User, n, record=Record)
+
+        self.assertEqual(records[-1], Record(f"user{n - 1}", n - 1))
+
+        columns = resolve_many(User, n, columns=True, numpy=False)
+
+        self.assertEqual(columns["id"], array("q", range(n)))
+        self.assertEqual(columns["name"], [f"user{i}" for i in range(n)])
+
+        with self.assertRaises(TypeError):
+            resolve_many(int, n, record=Record)
+
+
+if __name__ == "__main__":
+    unittest.main()
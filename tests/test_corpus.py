@@ -0,0 +1,137 @@
+import os
+import tempfile
+import time
+import unittest
+
+from protestr import Corpus, provide, settings
+from protestr._corpus import fingerprint
+from protestr.specs import between
+
+
+class Resource:
+    def __teardown__(self):
+        pass
+
+
+class Config:
+    def __init__(self, host):
+        self.host = host
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+        self.calls = 0
+
+    def users(self):
+        self.calls += 1
+        return [{"id": between(1, 99), "name": str}] * 3
+
+    def provided(self, corpus, seed):
+        @settings(corpus=corpus, seed=seed)
+        @provide(users=self.users, resource=Resource)
+        @provide(resource=Resource)
+        def fn(users, resource):
+            return users, resource
+
+        return fn
+
+    def test_corpus_should_replay_data(self):
+        corpus = Corpus(self.path)
+        users, resource = self.provided(corpus, seed=1)()
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(os.listdir(self.path)), 2)
+
+        replayed_users, replayed_resource = self.provided(corpus, seed=1)()
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(replayed_users, users)
+        self.assertIsNot(replayed_resource, resource)
+
+        self.provided(corpus, seed=2)()
+
+        self.assertEqual(self.calls, 4)
+
+        self.provided(Corpus(self.path, mode="record"), seed=1)()
+
+        self.assertEqual(self.calls, 6)
+
+    def test_corpus_should_require_seed(self):
+        with self.assertRaisesRegex(ValueError, "seed"):
+            self.provided(Corpus(self.path), seed=None)()
+
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_corpus_should_evict_least_recently_used(self):
+        corpus = Corpus(self.path)
+
+        for i in range(3):
+            corpus.store(f"e{i}", {"x": "x" * 1000})
+            os.utime(os.path.join(self.path, f"e{i}.pickle"), (i, i))
+
+        self.assertEqual(corpus.load("e0"), {"x": "x" * 1000})
+
+        corpus.max_bytes = 3500
+        corpus.store("e3", {"x": "x" * 1000})
+
+        self.assertEqual(
+            sorted(os.listdir(self.path)), ["e0.pickle", "e2.pickle", "e3.pickle"]
+        )
+
+    def test_fingerprint_should_identify_equivalent_specs(self):
+        self.assertEqual(fingerprint(between(1, 99)), fingerprint(between(1, 99)))
+        self.assertNotEqual(fingerprint(between(1, 99)), fingerprint(between(1, 98)))
+        self.assertNotEqual(
+            fingerprint(lambda: time.time()), fingerprint(lambda: time.sleep())
+        )
+        self.assertEqual(
+            fingerprint({"xs": [int, {str, float}]}),
+            fingerprint({"xs": [int, {float, str}]}),
+        )
+
+    def test_fingerprint_should_identify_objects_by_state(self):
+        self.assertEqual(fingerprint(Config("host-1")), fingerprint(Config("host-1")))
+        self.assertNotEqual(
+            fingerprint(Config("host-1")), fingerprint(Config("host-2"))
+        )
+
+    def test_fingerprint_should_ignore_plans_of_provided_specs(self):
+        @provide(id=between(1, 99))
+        def user(id):
+            return {"id": id}
+
+        before = fingerprint([user] * 3)
+        user()
+
+        self.assertEqual(fingerprint([user] * 3), before)
+
+    def test_corpus_should_skip_unfingerprintable_specs(self):
+        unpicklable = Config(lambda: None)
+        corpus = Corpus(self.path)
+
+        with self.assertLogs("protestr", "WARNING"):
+            entry = corpus.entry(Config, 0, 1, {"config": unpicklable})
+
+        self.assertIsNone(entry)
+        self.assertEqual(corpus.load(entry), {})
+
+    def test_corpus_should_skip_unpicklable_values(self):
+        corpus = Corpus(self.path)
+
+        with self.assertLogs("protestr", "WARNING") as logs:
+            corpus.store("e", {"x": 1, "f": lambda: None})
+
+        self.assertIn("f", logs.output[0])
+        self.assertEqual(corpus.load("e"), {"x": 1})
+
+    def test_corpus_should_raise_for_unknown_modes(self):
+        with self.assertRaises(ValueError):
+            Corpus(self.path, mode="append")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+from threading import Event
+
+from protestr import provide, settings
+from protestr.specs import deadline, ready, uses
+
+
+class Resource:
+    def __init__(self):
+        self.torndown = Event()
+
+    def __teardown__(self):
+        self.torndown.set()
+
+
+class TestDeadlines(unittest.TestCase):
+    def setUp(self):
+        self.release = Event()
+        self.addCleanup(self.release.set)
+        self.built = []
+        self.late = Resource()
+
+    def resource(self):
+        self.built.append(resource := Resource())
+        return resource
+
+    def hanging(self):
+        self.release.wait(5)
+        return self.late
+
+    def test_provide_should_time_out_resolving_fixtures(self):
+        @settings(resolve_timeout=0.1)
+        @provide(first=self.resource, slow=self.hanging, last=self.resource)
+        def fn():
+            self.fail("injected after timeout")
+
+        with self.assertRaises(TimeoutError) as raised:
+            fn()
+
+        self.assertIn("slow", str(raised.exception))
+        self.assertIn("hanging", str(raised.exception))
+        self.assertEqual(len(self.built), 1)
+        self.assertTrue(self.built[0].torndown.is_set())
+
+        self.release.set()
+
+        self.assertTrue(self.late.torndown.wait(5))
+
+    def test_provide_should_time_out_resolving_specs_concurrently(self):
+        @settings(workers=2)
+        @provide(fast=self.resource, slow=deadline(self.hanging, 0.1))
+        def fn():
+            self.fail("injected after timeout")
+
+        with self.assertRaises(TimeoutError) as raised:
+            fn()
+
+        self.assertIn("slow", str(raised.exception))
+        self.assertIn("TestDeadlines.hanging", str(raised.exception))
+        self.assertTrue(self.built[0].torndown.is_set())
+
+    def test_deadline_should_keep_requirements_and_markers(self):
+        def probe(_):
+            return True
+
+        slow = deadline(ready(uses("x", then=lambda x: x + 1), probe), 1)
+
+        @provide(x=1, y=slow)
+        def fn(x, y):
+            return y
+
+        self.assertEqual(fn(), 2)
+        self.assertEqual(slow.__requires__, ("x",))
+        self.assertIs(slow.__probe__, probe)
+        self.assertEqual(slow.__deadline__, (1, None))
+
+    def test_provide_should_time_out_tearing_down(self):
+        stuck = Resource()
+        stuck.__teardown__ = self.release.wait
+
+        @settings(teardown_timeout=0.1)
+        @provide(resource=self.resource, stuck=lambda: stuck)
+        def fn():
+            pass
+
+        with self.assertRaises(TimeoutError) as raised:
+            fn()
+
+        self.assertIn("stuck", str(raised.exception))
+        self.assertTrue(self.built[0].torndown.is_set())
+
+    def test_provide_should_cancel_async_specs(self):
+        cancelled = []
+
+        async def hanging():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        @provide(resource=self.resource, slow=deadline(hanging, 0.05))
+        async def fn():
+            self.fail("injected after timeout")
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(fn())
+
+        self.assertEqual(cancelled, [True])
+        self.assertTrue(self.built[0].torndown.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
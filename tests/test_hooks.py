@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from protestr import provide
+from protestr.hooks import Collector, add_hook, remove_hook
+
+
+class Resource:
+    def __teardown__(self):
+        pass
+
+
+class TestHooks(unittest.TestCase):
+    def test_hooks_should_observe_resolution_and_teardown(self):
+        events = []
+
+        @provide(x=Resource, y=int)
+        @provide(x=Resource)
+        def inner(x, y):
+            pass
+
+        @provide(z=str)
+        def outer(z):
+            inner()
+
+        add_hook(events.append)
+
+        try:
+            outer()
+        finally:
+            remove_hook(events.append)
+
+        self.assertEqual(
+            [(e.kind, e.phase, e.key, e.patch, e.depth) for e in events],
+            [
+                ("resolve", "start", "z", 0, 1),
+                ("resolve", "end", "z", 0, 1),
+                ("resolve", "start", "x", 0, 2),
+                ("resolve", "end", "x", 0, 2),
+                ("resolve", "start", "y", 0, 2),
+                ("resolve", "end", "y", 0, 2),
+                ("teardown", "start", "x", 0, 2),
+                ("teardown", "end", "x", 0, 2),
+                ("resolve", "start", "x", 1, 2),
+                ("resolve", "end", "x", 1, 2),
+                ("resolve", "start", "y", 1, 2),
+                ("resolve", "end", "y", 1, 2),
+                ("teardown", "start", "x", 1, 2),
+                ("teardown", "end", "x", 1, 2),
+            ],
+        )
+        self.assertTrue(all(e.duration is None for e in events[::2]))
+        self.assertTrue(all(e.duration >= 0 for e in events[1::2]))
+        self.assertIsInstance(events[-1].spec, Resource)
+
+    @patch("protestr._hooks.perf_counter")
+    def test_hooks_should_cost_nothing_while_unused(self, perf_counter):
+        @provide(x=Resource, y=[int])
+        def fn(x, y):
+            pass
+
+        fn()
+
+        perf_counter.assert_not_called()
+
+    def test_collector_should_summarize_and_trace(self):
+        @provide(x=Resource, y=int)
+        def fn(x, y):
+            pass
+
+        with Collector() as collector:
+            fn()
+            fn()
+
+        fn()
+
+        self.assertEqual(len(collector.events), 6)
+        self.assertEqual(
+            {k: v[0] for k, v in collector.costs().items()},
+            {
+                ("resolve", f"{__name__}.Resource"): 2,
+                ("resolve", "builtins.int"): 2,
+                ("teardown", f"{__name__}.Resource"): 2,
+            },
+        )
+        self.assertIn(f"{__name__}.Resource", collector.summary())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            collector.write_trace(path)
+
+            with open(path) as f:
+                trace = json.load(f)
+
+        self.assertEqual(len(trace["traceEvents"]), 6)
+        self.assertEqual(
+            {e["cat"] for e in trace["traceEvents"]}, {"resolve", "teardown"}
+        )
+
+    def test_collector_should_name_provided_specs(self):
+        @provide(x=int)
+        def user(x):
+            return x
+
+        @provide(user=user)
+        def fn(user):
+            pass
+
+        with Collector() as collector:
+            fn()
+
+        self.assertIn(
+            (
+                "resolve",
+                (
+                    f"{__name__}.TestHooks.test_collector_should_name_provided_specs"
+                    ".<locals>.user"
+                ),
+            ),
+            collector.costs(),
+        )
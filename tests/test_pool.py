@@ -0,0 +1,111 @@
+import unittest
+from threading import Event
+
+from protestr import provide, resolve
+from protestr.specs import pooled
+
+
+class Resource:
+    instances = ()
+
+    def __init__(self):
+        self.torndown = False
+        Resource.instances += (self,)
+
+    def __teardown__(self):
+        self.torndown = True
+
+
+class TestPool(unittest.TestCase):
+    def setUp(self):
+        Resource.instances = ()
+
+    def test_pooled_should_provide_prebuilt_instances(self):
+        pool = pooled(Resource, size=2)
+
+        @provide(resource=pool)
+        def fn(resource):
+            return resource
+
+        resource = fn()
+
+        self.assertTrue(resource.torndown)
+        self.assertIn(resource, Resource.instances)
+
+        pool.close()
+
+        self.assertEqual(len(Resource.instances), 3)
+        self.assertTrue(all(r.torndown for r in Resource.instances))
+
+    def test_pooled_should_tear_down_resources_resolved_inside(self):
+        class Service:
+            def __init__(self):
+                self.resource = resolve(Resource)
+
+        pool = pooled(Service, size=2)
+
+        @provide(service=pool)
+        def fn(service):
+            return service
+
+        service = fn()
+
+        self.assertTrue(service.resource.torndown)
+
+        pool.close()
+
+        self.assertEqual(len(Resource.instances), 3)
+        self.assertTrue(all(r.torndown for r in Resource.instances))
+
+    def test_pooled_should_refill_in_background(self):
+        built = Event()
+
+        def spec():
+            built.set()
+            return Resource()
+
+        pool = pooled(spec)
+        pool()
+
+        self.assertTrue(built.wait(5))
+
+        pool.close()
+
+        self.assertEqual(len(Resource.instances), 2)
+
+    def test_pooled_should_evict_idle_instances(self):
+        pool = pooled(Resource, size=1, max_idle=0)
+        pool.warm()
+        pool._changed.acquire()
+
+        while pool._building:
+            pool._changed.wait()
+
+        pool._changed.release()
+
+        first = Resource.instances[0]
+        taken = pool()
+
+        self.assertTrue(first.torndown)
+        self.assertIsNot(taken, first)
+
+        pool.close()
+
+    def test_pooled_should_raise_build_errors(self):
+        def spec():
+            raise RuntimeError("failure")
+
+        pool = pooled(spec)
+
+        with self.assertRaises(RuntimeError):
+            pool()
+
+        pool.close()
+
+    def test_pooled_should_raise_for_invalid_size(self):
+        with self.assertRaises(ValueError):
+            pooled(Resource, size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
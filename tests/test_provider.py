@@ -1,6 +1,13 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, call
-from protestr import provide
+from inspect import signature
+from threading import Barrier
+from protestr import provide, settings
+from protestr.specs import uses, reusable
 
 
 class TestProvider(unittest.TestCase):
@@ -95,6 +102,375 @@ class TestProvider(unittest.TestCase):
 
         self.assertEqual(resolve.mock_calls, [call(0), call(1), call(0), call(1)])
 
+    @patch("protestr.resolve")
+    def test_provide_should_resolve_only_requested_specs_lazily(self, resolve):
+        resolve.side_effect = lambda x: x
+
+        @settings(lazy=True)
+        @provide(0, x=1, y=2)
+        @provide(x=3)
+        def fn(x):
+            return x
+
+        self.assertEqual(3, fn())
+        self.assertEqual(resolve.mock_calls, [call(0), call(1), call(0), call(3)])
+
+    @patch("protestr.resolve")
+    def test_settings_should_apply_below_provide(self, resolve):
+        resolve.side_effect = lambda x: x
+
+        @provide(x=1, y=2)
+        @settings(lazy=True)
+        def fn(x):
+            return x
+
+        self.assertEqual(1, fn())
+        self.assertEqual(resolve.mock_calls, [call(1)])
+
+    def test_settings_should_raise_for_unknown_options(self):
+        with self.assertRaisesRegex(TypeError, "reslove_timeout, worker"):
+            settings(worker=4, reslove_timeout=1)
+
+    def test_provide_should_resolve_specs_concurrently(self):
+        barrier = Barrier(3, timeout=5)
+
+        def spec():
+            return barrier.wait()
+
+        @settings(workers=3)
+        @provide(spec, x=spec, y=spec)
+        def fn(x, y):
+            return x, y
+
+        x, y = fn()
+
+        self.assertEqual(len({0, 1, 2} - {x, y}), 1)
+
+    def test_provide_should_resolve_requirements_first(self):
+        class Resource:
+            instances = 0
+
+            def __init__(self):
+                Resource.instances += 1
+
+        @settings(workers=2)
+        @provide(
+            users=uses("db", then=lambda db: [db] * 2),
+            db=Resource,
+            other=uses("db", "users", then=lambda db, users: (db, users)),
+        )
+        def fn(db, users, other):
+            return db, users, other
+
+        db, users, other = fn()
+
+        self.assertEqual(users, [db, db])
+        self.assertEqual(other, (db, users))
+        self.assertEqual(Resource.instances, 1)
+
+    def test_provide_should_raise_for_circular_requirements(self):
+        @provide(
+            x=uses("y", then=lambda y: y),
+            y=uses("x", then=lambda x: x),
+        )
+        def fn(x, y):
+            pass
+
+        with self.assertRaises(ValueError):
+            fn()
+
+    @patch("protestr.resolve")
+    def test_provide_should_resolve_requirements_lazily(self, resolve):
+        resolve.side_effect = lambda x: x()
+
+        @settings(lazy=True)
+        @provide(x=lambda: 1, y=uses("x", then=lambda x: x + 1), z=lambda: 3)
+        def fn(y):
+            return y
+
+        self.assertEqual(fn(), 2)
+        self.assertEqual(len(resolve.mock_calls), 2)
+
+    def test_provide_should_provide_async_targets(self):
+        ready = {"x": asyncio.Event(), "y": asyncio.Event()}
+
+        def spec(this, other):
+            async def spec():
+                ready[this].set()
+                await asyncio.wait_for(ready[other].wait(), 5)
+                return this
+
+            return spec
+
+        @provide(x=spec("x", "y"), y=spec("y", "x"), z=uses("x", then=str.upper))
+        async def fn(x, y, z):
+            await asyncio.sleep(0)
+            return x, y, z
+
+        self.assertEqual(asyncio.run(fn()), ("x", "y", "X"))
+
+    def test_provide_should_tear_down_asynchronously(self):
+        class Resource:
+            torndown = False
+
+            async def __teardown__(self):
+                await asyncio.sleep(0)
+                self.torndown = True
+
+        resource = Resource()
+
+        @provide(x=lambda: resource)
+        async def fn():
+            pass
+
+        @provide(x=lambda: resource)
+        def sync_fn():
+            pass
+
+        asyncio.run(fn())
+
+        self.assertTrue(resource.torndown)
+
+        resource.torndown = False
+        sync_fn()
+
+        self.assertTrue(resource.torndown)
+
+        async def caller():
+            sync_fn()
+
+        resource.torndown = False
+        asyncio.run(caller())
+
+        self.assertTrue(resource.torndown)
+
+    def test_provide_should_raise_for_async_specs_of_sync_targets(self):
+        async def spec():
+            return 1
+
+        @provide(x=spec)
+        def fn(x):
+            self.fail("injected an un-awaited coroutine")
+
+        with self.assertRaisesRegex(TypeError, "resolve_async"):
+            fn()
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "requires fork"
+    )
+    def test_provide_should_run_patches_in_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "log")
+
+            class Resource:
+                def __teardown__(self):
+                    with open(log, "a") as f:
+                        f.write(f"{os.getpid()}\n")
+
+            @settings(processes=2)
+            @provide(x=1, resource=Resource)
+            @provide(x=2)
+            @provide(x=3)
+            def fn(x, resource):
+                return x, os.getpid()
+
+            @settings(processes=2, seed=1)
+            @provide(x=1)
+            @provide(x=0)
+            def failing(x):
+                if x == 0:
+                    raise ValueError(x)
+
+            x, pid = fn()
+
+            with open(log) as f:
+                pids = f.read().split()
+
+            self.assertEqual(x, 3)
+            self.assertNotEqual(pid, os.getpid())
+            self.assertEqual(len(pids), 3)
+            self.assertNotIn(str(os.getpid()), pids)
+
+            with self.assertRaises(ValueError) as raised:
+                failing()
+
+            self.assertIn("failed with seed", raised.exception.__notes__[0])
+
+    def test_provide_should_restore_resources_between_patches(self):
+        created = []
+
+        class Store:
+            def __init__(self):
+                self.data = {}
+                self.torndown = False
+                created.append(self)
+
+            def __snapshot__(self):
+                return {**self.data}
+
+            def __restore__(self, snapshot):
+                self.data = {**snapshot}
+
+            def __teardown__(self):
+                self.torndown = True
+
+        seen = []
+
+        @provide(store=Store, client=uses("store", then=lambda s: s), x=1)
+        @provide(x=2)
+        @provide(x=3)
+        @provide(store=lambda: Store(), x=4)
+        def fn(store, client, x):
+            seen.append((store, {**store.data}, store.torndown))
+            store.data[x] = x
+
+        @provide(store=Store, x=1)
+        @provide(x=0)
+        def failing(store, x):
+            if x == 0:
+                raise ValueError(x)
+
+        fn()
+
+        first, second = created
+
+        self.assertEqual(
+            seen,
+            [
+                (first, {}, False),
+                (first, {}, False),
+                (first, {}, False),
+                (second, {}, False),
+            ],
+        )
+        self.assertTrue(first.torndown)
+        self.assertTrue(second.torndown)
+
+        created.clear()
+
+        with self.assertRaises(ValueError):
+            failing()
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(created[0].torndown)
+
+    def test_provide_should_reuse_unchanged_keys(self):
+        created = []
+
+        class Container:
+            __reusable__ = True
+
+            def __init__(self):
+                self.torndowns = 0
+                created.append(self)
+
+            def __teardown__(self):
+                self.torndowns += 1
+
+        class Client(Container):
+            __reusable__ = False
+
+        seen = []
+
+        def fn(container, client, users, x):
+            seen.append((container, client, users))
+
+        fixtures = provide(x=2)(provide(x=3)(fn))
+        plain = provide(container=Container, client=Client, users=[int], x=1)(fixtures)
+        plain()
+
+        self.assertEqual(len({id(c) for c, _, _ in seen}), 1)
+        self.assertEqual(len({id(c) for _, c, _ in seen}), 3)
+        self.assertEqual(len({id(u) for _, _, u in seen}), 3)
+        self.assertEqual([c.torndowns for c in created], [1, 1, 1, 1])
+
+        seen.clear()
+        created.clear()
+
+        provide(container=Container, client=reusable(Client), users=[int], x=1)(
+            provide(x=2)(provide(x=3)(fn))
+        )()
+
+        self.assertEqual(len({(id(c), id(d)) for c, d, _ in seen}), 1)
+        self.assertEqual(len({id(u) for _, _, u in seen}), 3)
+        self.assertEqual([c.torndowns for c in created], [1, 1])
+
+        seen.clear()
+        created.clear()
+        client = reusable(uses("container", then=lambda container: Client()))
+
+        provide(container=Container, client=client, users=[int], x=1)(
+            provide(x=2)(provide(x=3)(fn))
+        )()
+
+        self.assertEqual(len({(id(c), id(d)) for c, d, _ in seen}), 1)
+        self.assertEqual([c.torndowns for c in created], [1, 1])
+
+        seen.clear()
+
+        settings(incremental=True)(
+            provide(users=[int], x=1)(provide(x=2)(provide(x=3)(fn)))
+        )(container=None, client=None)
+
+        self.assertEqual(len({(*u,) for _, _, u in seen}), 1)
+        self.assertEqual(len({id(u) for _, _, u in seen}), 3)
+
+    def test_provide_should_not_leak_mutations_of_reused_data(self):
+        seen = []
+
+        @settings(incremental=True)
+        @provide(xs=[int] * 3, y=1)
+        @provide(y=2)
+        @provide(y=3)
+        def fn(xs, y):
+            seen.append([*xs])
+            xs.append(y)
+
+        fn()
+
+        self.assertEqual(seen[0], seen[1])
+        self.assertEqual(seen[0], seen[2])
+        self.assertEqual(len(seen[0]), 3)
+
+    def test_provide_should_plan_calls_once(self):
+        seen = []
+
+        @provide(x=1)
+        def fn(x, y=None):
+            seen.append((x, y))
+
+        with patch("protestr._provider.signature", wraps=signature) as spy:
+            fn()
+            fn(x=2)
+            fn(y=3)
+
+            self.assertEqual(spy.call_count, 1)
+
+            provide(x=4)(fn)
+            settings(lazy=True)(fn)
+            fn()
+
+            self.assertEqual(spy.call_count, 2)
+
+        self.assertEqual(seen, [(1, None), (2, None), (1, 3), (4, None), (1, None)])
+
+    def test_provide_should_skip_unconfigured_features(self):
+        from protestr._provider import _Run
+
+        @provide(x=int, y=str)
+        def fn(x, y):
+            return x, y
+
+        with patch("protestr._provider._Run", wraps=_Run) as spy:
+            fn()
+            fn(y=uses("x", then=str))
+
+            self.assertEqual(spy.call_count, 1)
+
+            settings(workers=2)(fn)()
+
+            self.assertEqual(spy.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import socket
+import time
+import unittest
+
+from protestr import port_open, provide, settings
+from protestr.specs import ready, uses
+
+
+class Service:
+    def __init__(self, polls=3):
+        self.polls = polls
+        self.torndown = False
+
+    def __ready__(self):
+        self.polls -= 1
+        return self.polls <= 0
+
+    def __teardown__(self):
+        self.torndown = True
+
+
+class TestReady(unittest.TestCase):
+    def test_provide_should_poll_until_ready(self):
+        @settings(ready_backoff=(0.001, 0.01))
+        @provide(service=Service, ready_first=uses("service", then=lambda s: s.polls))
+        def fn(service, ready_first):
+            return service.polls, ready_first
+
+        self.assertEqual(fn(), (0, 0))
+
+    def test_provide_should_raise_and_tear_down_if_not_ready(self):
+        service = Service(polls=float("inf"))
+
+        @settings(ready_timeout=0.05, ready_backoff=(0.001, 0.01))
+        @provide(service=lambda: service)
+        def fn(service):
+            self.fail("injected before ready")
+
+        with self.assertRaises(TimeoutError) as raised:
+            fn()
+
+        self.assertIn("service", str(raised.exception))
+        self.assertTrue(service.torndown)
+
+    def test_provide_should_probe_concurrently(self):
+        def after(seconds):
+            start = []
+
+            def probe(_):
+                start.append(start[0] if start else time.monotonic())
+                return time.monotonic() - start[0] >= seconds
+
+            return probe
+
+        @settings(ready_backoff=(0.01, 0.01))
+        @provide(x=ready(int, after(0.2)), y=ready(str, after(0.2)))
+        def fn(x, y):
+            return x, y
+
+        start = time.monotonic()
+        x, y = fn()
+
+        self.assertIsInstance(x, int)
+        self.assertIsInstance(y, str)
+        self.assertLess(time.monotonic() - start, 0.35)
+
+    def test_ready_should_forward_requirements(self):
+        probed = []
+
+        def probe(y):
+            probed.append(y)
+            return True
+
+        @provide(x=1, y=ready(uses("x", then=lambda x: x + 1), probe))
+        def fn(x, y):
+            return y
+
+        self.assertEqual(fn(), 2)
+        self.assertEqual(probed, [2])
+
+    def test_provide_should_await_async_probes(self):
+        class AsyncService(Service):
+            async def __ready__(self):
+                await asyncio.sleep(0)
+                return super().__ready__()
+
+        @settings(ready_backoff=(0.001, 0.01))
+        @provide(service=AsyncService)
+        async def fn(service):
+            return service.polls
+
+        self.assertEqual(asyncio.run(fn()), 0)
+
+    def test_port_open_should_check_tcp_ports(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            port = server.getsockname()[1]
+
+            self.assertTrue(port_open("127.0.0.1", port))
+
+        self.assertFalse(port_open("127.0.0.1", port))
+
+
+if __name__ == "__main__":
+    unittest.main()
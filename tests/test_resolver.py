@@ -1,7 +1,11 @@
+import asyncio
+import gc
+import weakref
 import unittest
 from unittest.mock import MagicMock, patch, call
+from functools import partial
 from string import ascii_letters
-from protestr import provide, resolve
+from protestr import provide, resolve, resolve_async
 from protestr.specs import between, choice, choices
 
 
@@ -89,6 +93,153 @@ class TestResolver(unittest.TestCase):
         outer.assert_called_once()
         inner.assert_called_once()
 
+    @provide(x=int)
+    def test_resolve_should_reflect_changes_to_resolved_specs(self, x):
+        spec = [between(x, x)]
+
+        self.assertEqual(resolve(spec), [x])
+
+        spec.append(between(x + 1, x + 1))
+
+        self.assertEqual(resolve(spec), [x, x + 1])
+
+        spec[0] = between(x + 2, x + 2)
+
+        self.assertEqual(resolve(spec), [x + 2, x + 1])
+
+    @provide(x=int)
+    def test_resolve_should_reflect_changes_to_resolved_dicts(self, x):
+        spec = {"x": between(x, x)}
+
+        self.assertEqual(resolve(spec), {"x": x})
+
+        spec["x"] = between(x + 1, x + 1)
+        spec["y"] = between(x + 2, x + 2)
+
+        self.assertEqual(resolve(spec), {"x": x + 1, "y": x + 2})
+
+    @provide(x=int)
+    def test_resolve_should_not_share_constant_collections(self, x):
+        spec = {"xs": [x, (x,)]}
+
+        first = resolve(spec)
+        first["xs"].append(x)
+
+        self.assertEqual(resolve(spec), {"xs": [x, (x,)]})
+
+    def test_resolve_should_not_retain_collection_specs(self):
+        class Constant:
+            pass
+
+        constant = Constant()
+        ref = weakref.ref(constant)
+
+        resolve([int, {"x": constant}])
+        del constant
+        gc.collect()
+
+        self.assertIsNone(ref())
+
+    def test_resolve_should_not_retain_callable_specs(self):
+        class Resource:
+            pass
+
+        resource = Resource()
+        ref = weakref.ref(resource)
+
+        resolve(partial(lambda r: r, resource))
+        del resource
+        gc.collect()
+
+        self.assertIsNone(ref())
+
+    @provide(x=int)
+    def test_resolve_should_resolve_arbitrarily_deep_specs(self, x):
+        spec = x
+
+        for i in range(10000):
+            spec = [spec] if i % 2 else {"x": spec}
+
+        resolved = resolve(spec)
+
+        for i in reversed(range(10000)):
+            resolved = resolved[0] if i % 2 else resolved["x"]
+
+        self.assertEqual(resolved, x)
+
+        def chain(n):
+            return (lambda: chain(n - 1)) if n else [x]
+
+        self.assertEqual(resolve(lambda: chain(10000)), [x])
+
+    @provide(seed=int)
+    def test_resolve_should_resolve_within_budget(self, seed):
+        spec = {"ints": [int] * 3, "strs": (str, lambda: [str])}
+
+        self.assertEqual(resolve(spec, rng=seed, budget=12), resolve(spec, rng=seed))
+
+        with self.assertRaises(ValueError):
+            resolve(spec, budget=11)
+
+        with self.assertRaises(ValueError):
+            resolve(lambda: resolve([int] * 10), budget=5)
+
+    def test_resolve_should_raise_for_circular_specs(self):
+        spec = [int]
+        spec.append({"spec": spec})
+
+        with self.assertRaisesRegex(ValueError, "circular"):
+            resolve(spec)
+
+        def itself():
+            return itself
+
+        def ping():
+            return pong
+
+        def pong():
+            return ping
+
+        for spec in (itself, ping, [{"x": ping}]):
+            with self.assertRaisesRegex(ValueError, "circular"):
+                resolve(spec)
+
+    def test_resolve_should_resolve_self_generating_specs(self):
+        def tree(depth=0):
+            return {"children": [partial(tree, depth + 1)] * 2} if depth < 5 else {}
+
+        resolved = resolve(tree)
+
+        for _ in range(5):
+            resolved = resolved["children"][1]
+
+        self.assertEqual(resolved, {})
+
+    @provide(x=int)
+    def test_resolve_async_should_await_specs(self, x):
+        async def inner():
+            return between(x, x)
+
+        async def outer():
+            return [inner, {inner: (inner,)}]
+
+        self.assertEqual(asyncio.run(resolve_async(outer)), [x, {x: (x,)}])
+
+        with self.assertRaisesRegex(TypeError, "resolve_async"):
+            resolve([int, outer])
+
+    @patch("protestr._resolver.gather", wraps=asyncio.gather)
+    def test_resolve_async_should_gather_only_awaitables(self, gather):
+        async def spec():
+            return 1
+
+        asyncio.run(resolve_async([int] * 1000))
+
+        gather.assert_not_called()
+
+        self.assertEqual(asyncio.run(resolve_async([[int] * 1000, [spec]]))[1], [1])
+        self.assertEqual(gather.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from random import Random
+from unittest.mock import patch
+
+from protestr import provide, resolve, resolve_many, seeded, settings
+from protestr._rng import derive
+from protestr.specs import between, choice
+
+
+class TestRng(unittest.TestCase):
+    spec = (int, float, complex, bool, str, between(1, 99), choice("a", "b"))
+
+    @provide(seed=int)
+    def test_seeded_should_reproduce_resolution(self, seed):
+        with seeded(seed):
+            first = resolve(self.spec)
+
+        self.assertEqual(resolve(self.spec, rng=Random(seed)), first)
+
+    @provide(seed=int, n=between(1, 10))
+    def test_seeded_should_reproduce_batches(self, seed, n):
+        self.assertEqual(
+            resolve_many(self.spec, n, numpy=False, rng=seed),
+            resolve_many(self.spec, n, numpy=False, rng=seed),
+        )
+
+    @provide(seed=int)
+    def test_settings_should_seed_fixtures(self, seed):
+        results = []
+
+        def fn(x, y):
+            results.append((x, y, resolve(str)))
+
+        for workers in (1, 1, 2, 2):
+            settings(seed=seed, workers=workers)(
+                provide(x=self.spec, y=self.spec)(provide(y=[str])(fn))
+            )()
+
+        for first, second, third, fourth in (results[:4], results[4:]):
+            self.assertEqual((first, second), (third, fourth))
+            self.assertNotEqual(first[0], first[1])
+            self.assertNotEqual(first, second)
+
+    @provide(seed=int)
+    @patch("protestr._provider.derive", wraps=derive)
+    def test_provide_should_derive_generators_only_for_workers(self, derive, seed):
+        @provide(x=int, y=[str])
+        def fn(x, y):
+            return x
+
+        self.assertIsInstance(fn(), int)
+        self.assertIsInstance(settings(seed=seed)(fn)(), int)
+
+        derive.assert_not_called()
+
+        settings(workers=2)(fn)()
+
+        self.assertEqual(derive.call_count, 3)
+
+    def test_provide_should_report_reproducible_seed_on_failure(self):
+        values = []
+
+        @provide(x=int)
+        def inner(x):
+            return x
+
+        @provide(x=int, y=[str, inner])
+        def fn(x, y):
+            values.append((x, y, resolve(float)))
+            raise RuntimeError("failure")
+
+        with self.assertRaises(RuntimeError) as context:
+            fn()
+
+        if hasattr(context.exception, "add_note"):
+            seed = int(context.exception.__notes__[0].rpartition(" ")[2])
+
+            with self.assertRaises(RuntimeError):
+                settings(seed=seed)(fn)()
+
+            self.assertEqual(values[0], values[1])
+
+    @provide(seed=int)
+    def test_provide_should_report_seed_on_failure(self, seed):
+        @settings(seed=seed)
+        @provide(x=int)
+        def fn(x):
+            raise RuntimeError("failure")
+
+        with self.assertRaises(RuntimeError) as context:
+            fn()
+
+        if hasattr(context.exception, "add_note"):
+            self.assertIn(repr(seed), context.exception.__notes__[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import asyncio
+import unittest
+from threading import Barrier
+
+from protestr import provide, release, resolve, settings
+from protestr.specs import scoped, uses
+
+
+class Resource:
+    def __init__(self):
+        self.resets = 0
+        self.torndown = False
+
+    def __reset__(self):
+        self.resets += 1
+
+    def __teardown__(self):
+        self.torndown = True
+
+
+class TestScopes(unittest.TestCase):
+    def tearDown(self):
+        release()
+
+    def test_scoped_should_reuse_within_class(self):
+        class Suite:
+            @provide(db=scoped(Resource, "class"))
+            def test_a(self, db):
+                return db
+
+            @provide(db=scoped(Resource, "class"))
+            def test_b(self, db):
+                return db
+
+        db = Suite().test_a()
+
+        self.assertIs(Suite().test_b(), db)
+        self.assertEqual(db.resets, 1)
+        self.assertFalse(db.torndown)
+
+        release("class")
+
+        self.assertTrue(db.torndown)
+
+    def test_scoped_should_keep_resources_resolved_inside(self):
+        class Service:
+            def __init__(self):
+                self.resource = resolve(Resource)
+
+        @provide(service=scoped(Service, "session"))
+        def fn(service):
+            return service
+
+        service = fn()
+
+        self.assertFalse(service.resource.torndown)
+        self.assertIs(fn(), service)
+
+        release("session")
+
+        self.assertTrue(service.resource.torndown)
+
+    def test_scoped_should_forward_requirements(self):
+        class Client(Resource):
+            def __init__(self, x):
+                super().__init__()
+                self.x = x
+
+        @provide(x=int, client=scoped(uses("x", then=Client), "session"))
+        def fn(x, client):
+            return x, client
+
+        x, client = fn()
+
+        self.assertEqual(client.x, x)
+        self.assertIs(fn()[1], client)
+
+    def test_scoped_should_restore_snapshots_before_reuse(self):
+        class Store(Resource):
+            def __init__(self):
+                super().__init__()
+                self.data = {}
+
+            def __snapshot__(self):
+                return {**self.data}
+
+            def __restore__(self, snapshot):
+                self.data = {**snapshot}
+
+        @provide(store=scoped(Store, "session"))
+        def fn(store):
+            data = {**store.data}
+            store.data["x"] = 1
+            return data
+
+        self.assertEqual(fn(), {})
+        self.assertEqual(fn(), {})
+
+    def test_scoped_should_tear_down_when_scope_changes(self):
+        class Suite:
+            @provide(db=scoped(Resource, "class"))
+            def test(self, db):
+                return db
+
+        class Other:
+            @provide(db=scoped(Resource, "class"))
+            def test(self, db):
+                return db
+
+        db = Suite().test()
+        other_db = Other().test()
+
+        self.assertIsNot(other_db, db)
+        self.assertTrue(db.torndown)
+        self.assertFalse(other_db.torndown)
+
+    def test_scoped_should_reuse_within_module(self):
+        spec = scoped([Resource] * 2, "module")
+
+        @provide(dbs=spec)
+        def fn(dbs):
+            return dbs
+
+        @provide(dbs=spec)
+        def other_fn(dbs):
+            return dbs
+
+        dbs = fn()
+
+        self.assertEqual(other_fn(), dbs)
+        self.assertEqual([db.resets for db in dbs], [1, 1])
+        self.assertFalse(any(db.torndown for db in dbs))
+
+    def test_scoped_should_not_reuse_within_function(self):
+        spec = scoped(Resource, "function")
+
+        @provide(db=spec)
+        def fn(db):
+            return db
+
+        db = fn()
+
+        self.assertIsNot(fn(), db)
+        self.assertTrue(db.torndown)
+
+    def test_scoped_should_resolve_different_specs_concurrently(self):
+        barrier = Barrier(2, timeout=5)
+
+        class Slow(Resource):
+            def __init__(self):
+                super().__init__()
+                barrier.wait()
+
+        class Other(Slow):
+            pass
+
+        @settings(workers=2)
+        @provide(a=scoped(Slow, "session"), b=scoped(Other, "session"))
+        def fn(a, b):
+            return a, b
+
+        _, b = fn()
+
+        self.assertIsInstance(b, Other)
+
+    def test_scoped_should_resolve_shared_spec_once(self):
+        spec = scoped(Resource, "session")
+
+        @settings(workers=2)
+        @provide(a=spec, b=spec)
+        def fn(a, b):
+            return a, b
+
+        a, b = fn()
+
+        self.assertIs(a, b)
+        self.assertEqual(a.resets, 1)
+
+    def test_scoped_should_resolve_async_specs(self):
+        async def connect():
+            await asyncio.sleep(0)
+            return Resource()
+
+        @provide(db=scoped(connect, "session"))
+        async def fn(db):
+            return db
+
+        db = asyncio.run(fn())
+
+        self.assertIsInstance(db, Resource)
+        self.assertIs(asyncio.run(fn()), db)
+        self.assertEqual(db.resets, 1)
+
+        release("session")
+
+        self.assertTrue(db.torndown)
+
+    def test_scoped_should_raise_for_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            scoped(Resource, "package")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,15 @@
 import unittest
 from unittest.mock import MagicMock, patch, call
-from protestr import provide
-from protestr.specs import between, choice, sample, choices, recipe
+from protestr import provide, seeded
+from protestr.specs import between, choice, sample, choices, recipe, lazy, stream
+from protestr.specs import port, slot, unique, lines
+from itertools import islice
+from socket import socket
+import tempfile
+import os
 import random
+import subprocess
+import sys
 
 
 class TestSpecs(unittest.TestCase):
@@ -244,6 +251,198 @@ class TestSpecs(unittest.TestCase):
         resolve.assert_called_once_with(elems_specs)
         then.assert_called_once_with(elems)
 
+    @provide(x=int)
+    def test_lazy_should_resolve_on_first_attribute_access(self, x):
+        class Resource:
+            def __init__(self):
+                self.x = x
+
+        spec = MagicMock(side_effect=Resource)
+
+        proxy = lazy(spec)()
+
+        spec.assert_not_called()
+        self.assertEqual(proxy.x, x)
+        self.assertEqual(proxy.x, x)
+        spec.assert_called_once()
+
+    def test_lazy_should_tear_down_only_if_resolved(self):
+        class Resource:
+            def __init__(self):
+                self.torndown = False
+
+            def __teardown__(self):
+                self.torndown = True
+
+        spec = MagicMock(side_effect=Resource)
+
+        lazy(spec)().__teardown__()
+
+        spec.assert_not_called()
+
+        proxy = lazy(spec)()
+
+        self.assertFalse(proxy.torndown)
+
+        proxy.__teardown__()
+
+        self.assertTrue(proxy.torndown)
+
+    def test_stream_should_tear_down_each_item_after_use(self):
+        class Resource:
+            def __init__(self):
+                self.torndown = False
+
+            def __teardown__(self):
+                self.torndown = True
+
+        items = stream(Resource, n=3)()
+        first = next(items)
+
+        self.assertFalse(first.torndown)
+
+        second, third = next(items), next(items)
+
+        self.assertTrue(first.torndown)
+        self.assertTrue(second.torndown)
+        self.assertFalse(third.torndown)
+
+        items.__teardown__()
+
+        self.assertTrue(third.torndown)
+        self.assertEqual([*items], [])
+
+    @provide(n=between(1, 20), chunk=between(1, 5))
+    def test_stream_should_yield_chunks(self, n, chunk):
+        chunks = [*stream(int, n=n, chunk=chunk)()]
+
+        self.assertEqual(sum(map(len, chunks)), n)
+        self.assertTrue(all(len(c) == chunk for c in chunks[:-1]))
+        self.assertTrue(all(isinstance(x, int) for c in chunks for x in c))
+
+    @provide(items=stream(str))
+    def test_stream_should_be_unbounded_and_reproducible(self, items):
+        self.assertEqual(len([*islice(items, 100)]), 100)
+
+        with seeded(0):
+            first = [*islice(stream(str)(), 10)]
+
+        with seeded(0):
+            self.assertEqual([*islice(stream(str)(), 10)], first)
+
+    @provide(n=between(1, 100))
+    def test_specs_should_draw_from_lazy_populations(self, n):
+        huge = range(10**15)
+
+        self.assertIn(choice(huge)(), huge)
+        self.assertEqual(len({*sample(huge, k=n)()}), n)
+        self.assertTrue(all(x in huge for x in choices(huge, k=n)()))
+        self.assertEqual(len({*sample(between(1, 10**15), k=n)()}), n)
+        self.assertEqual(choices(between(n, n), k=3)(), [n] * 3)
+
+        with tempfile.NamedTemporaryFile("w", delete=False) as f:
+            f.write("\n".join(f"line {i}" for i in range(n)))
+
+        self.addCleanup(os.remove, f.name)
+        population = lines(f.name)
+
+        self.assertEqual(len(population), n)
+        self.assertEqual(population[-1], f"line {n - 1}")
+        self.assertEqual(population[::-1], [f"line {i}" for i in reversed(range(n))])
+        self.assertEqual(population[1:3], [f"line {i}" for i in range(1, min(n, 3))])
+        self.assertEqual(sorted(sample(population, k=n)()), sorted(population))
+        self.assertIn(choice(population)(), population)
+
+        with population:
+            self.assertEqual(population[0], "line 0")
+
+        self.assertIsNone(population._map)
+        self.assertEqual(population[0], "line 0")
+        population.close()
+
+    @provide(n=between(1, 99))
+    def test_unique_should_generate_distinct_values(self, n):
+        ids = unique(between(1, 99), k=n)()
+
+        self.assertEqual(len({*ids}), n)
+        self.assertTrue(all(1 <= x <= 99 for x in ids))
+
+        users = unique({"id": between(1, 99)}, k=n, key=lambda u: u["id"])()
+
+        self.assertEqual(len({u["id"] for u in users}), n)
+
+        with self.assertRaises(ValueError):
+            unique(between(1.0, 1.0), k=2)()
+
+        with self.assertRaises(ValueError):
+            unique(choice(1, 2), k=3)()
+
+    @provide(x=port(), y=port())
+    def test_port_should_allocate_free_ports(self, x, y):
+        self.assertNotEqual(x, y)
+
+        with socket() as s:
+            s.bind(("", x))
+
+    def test_slot_should_be_unique_across_processes(self):
+        name = f"test-{random.getrandbits(64)}"
+        allocate = (
+            "from protestr import resolve\n"
+            "from protestr.specs import slot\n"
+            f"print(resolve(slot({name!r})))"
+        )
+
+        def other():
+            return subprocess.run(
+                [sys.executable, "-c", allocate],
+                capture_output=True,
+                check=True,
+                text=True,
+                env={"PYTHONPATH": os.pathsep.join(sys.path)},
+            ).stdout.strip()
+
+        first = slot(name)()
+        second = slot(name)()
+        self.addCleanup(second.__teardown__)
+
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(other(), "2")
+
+        first.__teardown__()
+
+        self.assertEqual(other(), "0")
+        self.assertEqual(third := slot(name)(), 0)
+
+        third.__teardown__()
+
+    def test_slot_should_remove_lock_file_on_teardown(self):
+        allocated = slot(f"test-{random.getrandbits(64)}")()
+        path = allocated._lock.name
+
+        self.assertTrue(os.path.exists(path))
+
+        allocated.__teardown__()
+
+        if os.name == "posix":
+            self.assertFalse(os.path.exists(path))
+
+    def test_slot_should_keep_lock_files_in_directory(self):
+        allocated = slot(f"../{random.getrandbits(64)}/x")()
+        self.addCleanup(allocated.__teardown__)
+        directory = os.path.join(tempfile.gettempdir(), "protestr")
+
+        self.assertEqual(os.path.dirname(allocated._lock.name), directory)
+
+        with self.assertRaises(ValueError):
+            slot("")()
+
+    @patch("protestr._allocator._lock", return_value=None)
+    def test_slot_should_give_up_after_attempts(self, _lock):
+        with self.assertRaisesRegex(RuntimeError, "no free 'db' slot"):
+            slot("db")()
+
+        self.assertEqual(_lock.call_count, 100)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from threading import Barrier, Event
+from unittest.mock import patch
+
+from protestr import TeardownError, drain, provide, resolve, settings
+from protestr._teardown import _resources
+from protestr.specs import uses
+
+
+class TestTeardown(unittest.TestCase):
+    def test_teardown_should_run_concurrently(self):
+        barrier = Barrier(2, timeout=5)
+
+        class Resource:
+            def __teardown__(self):
+                barrier.wait()
+
+        @settings(workers=2)
+        @provide(x=Resource, y=Resource)
+        def fn():
+            pass
+
+        fn()
+
+    def test_teardown_should_follow_requirements(self):
+        torndown = []
+
+        class Resource:
+            def __init__(self, name):
+                self.name = name
+
+            def __teardown__(self):
+                torndown.append(self.name)
+
+        @settings(workers=3)
+        @provide(
+            app=uses("db", "cache", then=lambda db, cache: Resource("app")),
+            db=lambda: Resource("db"),
+            cache=uses("db", then=lambda db: [Resource("cache"), db]),
+        )
+        def fn():
+            pass
+
+        fn()
+
+        self.assertEqual(torndown, ["app", "cache", "db"])
+
+    def test_teardown_should_collect_errors(self):
+        class Failure:
+            def __teardown__(self):
+                raise RuntimeError("failure")
+
+        class Resource:
+            torndown = False
+
+            def __teardown__(self):
+                self.torndown = True
+
+        resource = Resource()
+
+        @provide(x=Failure, y=lambda: resource, z=Failure)
+        def fn():
+            pass
+
+        with self.assertRaises(TeardownError) as context:
+            fn()
+
+        self.assertEqual(len(context.exception.errors), 2)
+        self.assertTrue(resource.torndown)
+
+    def test_teardown_should_run_in_background(self):
+        started = Event()
+        release = Event()
+
+        class Resource:
+            torndown = False
+
+            def __teardown__(self):
+                started.set()
+                release.wait(5)
+                self.torndown = True
+
+        resource = Resource()
+
+        @settings(background=True)
+        @provide(x=lambda: resource)
+        def fn():
+            pass
+
+        fn()
+
+        self.assertTrue(started.wait(5))
+        self.assertFalse(resource.torndown)
+
+        release.set()
+        drain()
+
+        self.assertTrue(resource.torndown)
+
+    @patch("protestr._teardown._resources", wraps=_resources)
+    def test_teardown_should_track_resources_as_resolved(self, resources):
+        torndown = []
+
+        class Resource:
+            def __init__(self, name):
+                self.name = name
+
+            def __teardown__(self):
+                torndown.append(self.name)
+
+        @provide(
+            ints=[int] * 10000,
+            x=lambda: [Resource("a"), {"b": Resource("b")}],
+            y=lambda: resolve(Resource("c")) and 1,
+        )
+        def fn(ints, y):
+            return y
+
+        self.assertEqual(fn(), 1)
+        self.assertEqual(torndown, ["c", "b", "a"])
+
+        for c in resources.call_args_list:
+            self.assertEqual(c.args[0], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from protestr import provide, resolve, resolve_many
+from protestr.specs import between
+from protestr.types import configure, register, unregister
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TestTypes(unittest.TestCase):
+    def test_resolve_should_generate_builtin_types(self):
+        for kind in (bytes, bytearray, datetime, UUID, Decimal):
+            self.assertIsInstance(resolve(kind), kind)
+            self.assertTrue(all(type(x) is kind for x in resolve_many(kind, 100)))
+
+        self.assertEqual(resolve(UUID).version, 4)
+        self.assertTrue(1 <= len(resolve(bytes)) <= 50)
+        self.assertEqual(resolve(Decimal).as_tuple().exponent, -2)
+
+    def configure(self, kind, **options):
+        self.addCleanup(configure, kind, **configure(kind, **options))
+
+    @provide(lo=between(-1000, 1000), length=between(0, 10))
+    def test_configure_should_change_ranges(self, lo, length):
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+        self.configure(int, bounds=(lo, lo))
+        self.configure(str, length=(length, length), alphabet="ab")
+        self.configure(bytes, length=(length, length))
+        self.configure(datetime, bounds=(epoch, epoch))
+        self.configure(Decimal, bounds=(lo, lo + 1), places=1)
+
+        spec = {"int": int, "str": str, "bytes": bytes, "datetime": datetime}
+
+        for resolved in (resolve(spec), *resolve_many(spec, 10)):
+            self.assertEqual(resolved["int"], lo)
+            self.assertEqual(len(resolved["str"]), length)
+            self.assertLessEqual({*resolved["str"]}, {"a", "b"})
+            self.assertEqual(len(resolved["bytes"]), length)
+            self.assertEqual(resolved["datetime"], epoch)
+
+        self.assertTrue(lo <= resolve(Decimal) <= lo + 1)
+
+        with self.assertRaises(TypeError):
+            configure(int, length=(1, 2))
+
+    @provide(x=int, y=int)
+    def test_register_should_plug_in_handlers(self, x, y):
+        spec = [Point] * 3
+        self.addCleanup(unregister, Point)
+
+        with self.assertRaises(TypeError):
+            resolve(spec)
+
+        register(Point, lambda: Point(x, y))
+
+        self.assertEqual([(p.x, p.y) for p in resolve(spec)], [(x, y)] * 3)
+        self.assertEqual(len(resolve_many(Point, 5)), 5)
+
+        register(Point, lambda: Point(y, x), lambda n, rng: [Point(0, 0)] * n)
+
+        self.assertEqual([(p.x, p.y) for p in resolve(spec)], [(y, x)] * 3)
+        self.assertEqual([(p.x, p.y) for p in resolve_many(Point, 2)], [(0, 0)] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()